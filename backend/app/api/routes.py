@@ -2,50 +2,251 @@
 FastAPI routes for Pikachu Kawaii game.
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Optional
-from ..models.game import GameState, MoveRequest, Position
-from ..services.game_service import GameService
-from ..services.pokemon_data import get_all_pokemon_data
-
+import asyncio
+import logging
+import os
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Tuple, Union
+from ..models.game import (
+    COMPACT_MEDIA_TYPE, CompactGameState, GameState, GameDelta, GameEvent, MoveRequest,
+    BatchMoveRequest, MatchResult, SolveResult, ValidMove
+)
+from ..core.rules import rules_from_env
+from ..services.game_service import DeltaMark, GameService
+from ..services.game_store import GameLocks, StaleGameError, create_game_store, new_game_id
+from ..services.pokemon_data import CATALOGUE_RESPONSE, EncodedBody
+from ..services.sprite_atlas import load_atlas
+from ..services.work_pool import PoolSaturated, create_work_pool
+
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# In-memory game storage (for demo - use database in production)
-games: Dict[str, GameState] = {}
-game_service = GameService(rows=8, cols=12)
+# Development builds re-verify the incremental board indexes after every mutation;
+# GAME_RULES picks the level rules ("standard" or "classic" gravity levels)
+game_service = GameService(rows=8, cols=12, debug=os.getenv("ENVIRONMENT") == "development",
+                           rules=rules_from_env())
+# Game storage: bounded in-memory LRU by default, SQLite with GAME_STORE=sqlite
+games = create_game_store(exporter=game_service.export, resumer=game_service.resume_log)
+# Requests on one game are serialized; different games run concurrently
+game_locks = GameLocks()
+# Heavy operations leave the event loop; small boards are handled inline
+work_pool = create_work_pool()
+# Packed sprites (None until build_sprite_atlas.py was run)
+sprite_atlas = load_atlas()
+
+
+def _load_game(game_id: str) -> GameState:
+    """
+    Fetch a game from the store (clock brought up to date) or raise 404.
+    If the clock stopped or restarted on the way (time ran out, a pause
+    ended), the game is saved, so reads persist it too.
+    """
+    game_state = games.get(game_id)
+    if game_state is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    if game_service.tick(game_state):
+        _save_game(game_id, game_state)
+    return game_state
+
+
+def _save_game(game_id: str, game_state: GameState) -> None:
+    """
+    Store a changed game. If another worker stored the game after this copy
+    was loaded, the change is discarded and 409 returned with the stored
+    version (the store's conditional write is the cross-worker version check).
+    """
+    try:
+        games.put(game_id, game_state)
+    except StaleGameError:
+        current = games.get(game_id)
+        raise HTTPException(status_code=409, detail={
+            "message": "Game state has changed",
+            "version": current.version if current is not None else None
+        })
+
+
+async def sweep_expired_games() -> int:
+    """
+    End the in-memory games whose clock has run out.
+
+    Reading deadlines is lock-free; only expired games are locked, ticked
+    and saved. Games not in memory are caught up when they are next loaded.
+    """
+    now = time.time()
+    expired = 0
+    for game_id, game_state in games.cached():
+        deadline = game_service.deadline(game_state)
+        if deadline is None or deadline > now:
+            continue
+
+        async with game_locks(game_id):
+            # Reload: another worker may have changed (or ended) the game
+            game_state = games.get(game_id)
+            if game_state is None:
+                continue
+            game_service.tick(game_state)
+            if game_state.game_over:
+                try:
+                    games.put(game_id, game_state)
+                except StaleGameError:
+                    continue
+                expired += 1
+    return expired
+
+
+async def clock_sweeper(interval: float) -> None:
+    """Background task: run sweep_expired_games every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sweep_expired_games()
+        except Exception:
+            logger.exception("Clock sweep failed")
+
+
+async def store_maintainer(flush_interval: float, evict_interval: float) -> None:
+    """
+    Background task: write the store's pending games every `flush_interval`
+    seconds, so an idle server holds nothing back, and drop expired games
+    (from memory and from disk) every `evict_interval` seconds.
+    """
+    last_evict = time.monotonic()
+    while True:
+        await asyncio.sleep(flush_interval)
+        try:
+            games.flush()
+            if time.monotonic() - last_evict >= evict_interval:
+                last_evict = time.monotonic()
+                evicted = games.evict_expired()
+                if evicted:
+                    logger.info("Evicted %d expired games", evicted)
+        except Exception:
+            logger.exception("Store maintenance failed")
+
+
+def _check_version(game_state: GameState, expected_version: Optional[int]) -> None:
+    """
+    Optimistic concurrency: reject a mutation made against a stale board.
+
+    Clients that send `expected_version` get 409 (with the current version)
+    if another request changed the game since they last saw it. The game was
+    just loaded through the store, which checks a cached copy against the
+    stored row when workers share it; a change stored by another worker
+    between this check and the save is caught by _save_game.
+    """
+    if expected_version is not None and expected_version != game_state.version:
+        raise HTTPException(status_code=409, detail={
+            "message": "Game state has changed",
+            "version": game_state.version
+        })
+
+
+async def _offload(fn, *args, heavy: bool = True, **kwargs):
+    """Run game work through the pool; a full queue answers 503."""
+    try:
+        return await work_pool.run(fn, *args, offload=heavy, **kwargs)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly",
+                            headers={"Retry-After": "1"})
+
+
+def _is_heavy(game_state: GameState) -> bool:
+    """Check if work on this game's board should run on the pool."""
+    return work_pool.is_heavy(game_state.board.rows * game_state.board.cols)
+
+
+def delta_requested(view: Optional[str] = Query(None, pattern="^(full|delta)$"),
+                    x_state_format: Optional[str] = Header(None)) -> bool:
+    """
+    Response mode negotiation: `?view=delta` or `X-State-Format: delta` asks
+    for a GameDelta (changed cells + scalars) instead of the full GameState.
+    """
+    return view == "delta" or (view is None and x_state_format == "delta")
+
+
+def compact_requested(response: Response, accept: Optional[str] = Header(None)) -> bool:
+    """
+    Wire format negotiation: clients listing COMPACT_MEDIA_TYPE in Accept
+    get full states as CompactGameState (grid packed into one base64
+    string) instead of GameState with one JSON object per cell.
+    """
+    response.headers["Vary"] = "Accept"
+    return COMPACT_MEDIA_TYPE in (accept or "")
+
+
+def _snapshot(game_state: GameState, compact: bool) -> Union[GameState, CompactGameState]:
+    """Full state in the negotiated wire format."""
+    return game_service.export_compact(game_state) if compact else game_service.export(game_state)
+
+
+def _state_payload(game_state: GameState, delta: bool, mark: DeltaMark,
+                   compact: bool = False) -> dict:
+    """Full `game_state` (in the negotiated wire format) or `delta` part of a response."""
+    if delta:
+        changes = game_service.delta(game_state, mark=mark)
+        if changes is not None:
+            return {"delta": changes}
+    return {"game_state": _snapshot(game_state, compact)}
 
 
 @router.post("/game/new")
-async def create_game(level: int = 1):
+async def create_game(level: int = 1, solvable: bool = True,
+                      seed: Optional[int] = Query(None, ge=0, le=2**53 - 1),
+                      compact: bool = Depends(compact_requested)):
     """
     Create a new game.
 
+    The game's RNG seed is returned in the state; passing it back as `seed`
+    (same level and board size) recreates the same board. `rules` tells the
+    client the level's turn limit, border rule and gravity direction.
+
     DSA Operations:
     - Fisher-Yates shuffle for board generation
+    - Reverse pair construction for boards that can always be cleared
     - 2D matrix initialization
     """
-    game_state = game_service.create_new_game(level=level)
-    game_id = f"game_{len(games)}"
-    games[game_id] = game_state
+    game_state = await _offload(game_service.create_new_game, level=level, solvable=solvable, seed=seed,
+                                heavy=work_pool.is_heavy(game_service.rows * game_service.cols))
+    game_id = new_game_id()
+    _save_game(game_id, game_state)
 
     return {
         "game_id": game_id,
-        "game_state": game_state
+        "game_state": _snapshot(game_state, compact),
+        "rules": game_service.ruleset(level)._asdict()
     }
 
 
-@router.get("/game/{game_id}", response_model=GameState)
-async def get_game(game_id: str):
-    """Get current game state."""
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
+@router.get("/game/{game_id}", response_model=Union[GameState, CompactGameState, GameDelta])
+async def get_game(game_id: str, since: Optional[int] = None,
+                   delta: bool = Depends(delta_requested),
+                   compact: bool = Depends(compact_requested)):
+    """
+    Get current game state.
+
+    The full snapshot is the resync path. In delta mode with `since`, only
+    the cells changed after that version are returned (falls back to the
+    full snapshot when the version is too old).
+    """
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
 
-    return games[game_id]
+        if delta and since is not None:
+            changes = game_service.delta(game_state, since=since)
+            if changes is not None:
+                return changes
+
+        return _snapshot(game_state, compact)
 
 
 @router.post("/game/{game_id}/move")
-async def make_move(game_id: str, move: MoveRequest):
+async def make_move(game_id: str, move: MoveRequest, expected_version: Optional[int] = None,
+                    delta: bool = Depends(delta_requested),
+                    compact: bool = Depends(compact_requested)):
     """
     Make a move by connecting two Pokemon.
 
@@ -58,35 +259,106 @@ async def make_move(game_id: str, move: MoveRequest):
     - success: bool
     - path: List of positions if valid
     - turns: Number of turns in path
-    - game_state: Updated game state
+    - game_state: Updated game state (or delta: changes only, in delta mode)
+
+    With `expected_version`, the move is rejected with 409 if the game has
+    changed since that version.
     """
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        _check_version(game_state, expected_version)
 
-    game_state = games[game_id]
+        if game_state.game_over or game_state.victory:
+            raise HTTPException(status_code=400, detail="Game is already finished")
 
-    if game_state.game_over or game_state.victory:
-        raise HTTPException(status_code=400, detail="Game is already finished")
+        mark = game_service.mark(game_state)
+        success, result = await _offload(_play_move, game_state, move,
+                                         heavy=_is_heavy(game_state))
+        _save_game(game_id, game_state)
 
-    success, result = game_service.make_move(game_state, move.pos1, move.pos2)
+        if not success:
+            return {
+                "success": False,
+                "message": "Invalid move - no valid path exists",
+                **_state_payload(game_state, delta, mark, compact)
+            }
+
+        return {
+            "success": True,
+            "path": result.path,
+            "turns": result.turns,
+            **_state_payload(game_state, delta, mark, compact)
+        }
+
+
+@router.post("/game/{game_id}/moves")
+async def make_moves(game_id: str, batch: BatchMoveRequest, expected_version: Optional[int] = None,
+                     delta: bool = Depends(delta_requested),
+                     compact: bool = Depends(compact_requested)):
+    """
+    Apply an ordered list of moves in one request (bots, replays, clients
+    sending moves buffered while offline).
 
-    if not success:
+    Moves are applied one by one exactly like /move. Processing stops at the
+    first invalid move or when the game ends.
+
+    Returns:
+    - results: success/path/turns for each processed move
+    - applied: Number of moves applied successfully
+    - game_state: Final game state (or delta: changes only, in delta mode)
+    """
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        _check_version(game_state, expected_version)
+
+        if game_state.game_over or game_state.victory:
+            raise HTTPException(status_code=400, detail="Game is already finished")
+
+        mark = game_service.mark(game_state)
+        results = await _offload(_play_moves, game_state, batch.moves,
+                                 heavy=len(batch.moves) > 1 or _is_heavy(game_state))
+        _save_game(game_id, game_state)
         return {
-            "success": False,
-            "message": "Invalid move - no valid path exists",
-            "game_state": game_state
+            "results": results,
+            "applied": sum(1 for item in results if item["success"]),
+            **_state_payload(game_state, delta, mark, compact)
         }
 
+
+def _play_move(game_state: GameState, move: MoveRequest) -> Tuple[bool, Optional[MatchResult]]:
+    """Apply one move, then shuffle if the board is left without valid moves."""
+    success, result = game_service.make_move(game_state, move.pos1, move.pos2)
+
     # Check if shuffle is needed
-    if not game_service.has_valid_moves(game_state) and not game_state.victory:
+    if success and not game_service.has_valid_moves(game_state) and not game_state.victory:
         game_service.shuffle_board(game_state)
 
-    return {
-        "success": True,
-        "path": result.path,
-        "turns": result.turns,
-        "game_state": game_state
-    }
+    return success, result
+
+
+def _play_moves(game_state: GameState, moves: List[MoveRequest]) -> List[dict]:
+    """Apply moves in order until one fails or the game ends."""
+    results = []
+    for move in moves:
+        if game_state.game_over or game_state.victory:
+            break
+
+        success, result = _play_move(game_state, move)
+
+        if not success:
+            results.append({
+                "success": False,
+                "message": "Invalid move - no valid path exists"
+            })
+            break
+
+        results.append({
+            "success": True,
+            "path": result.path,
+            "turns": result.turns
+        })
+
+    return results
 
 
 @router.post("/game/{game_id}/hint")
@@ -95,19 +367,16 @@ async def get_hint(game_id: str):
     Get a hint for a valid move.
 
     DSA Operations:
-    - Hash map for grouping pokemon by type
-    - Pathfinding for each potential pair
-    - Early termination on first valid path
+    - Hash set of connectable pairs (MoveIndex), updated move by move
+    - Fewest-turn pair among them, early exit on a direct pair
     """
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
-
-    game_state = games[game_id]
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
 
-    if game_state.game_over or game_state.victory:
-        raise HTTPException(status_code=400, detail="Game is already finished")
+        if game_state.game_over or game_state.victory:
+            raise HTTPException(status_code=400, detail="Game is already finished")
 
-    hint = game_service.find_hint(game_state)
+        hint = await _offload(game_service.find_hint, game_state)
 
     if hint is None:
         return {
@@ -123,8 +392,26 @@ async def get_hint(game_id: str):
     }
 
 
+@router.get("/game/{game_id}/valid-moves", response_model=List[ValidMove])
+async def list_valid_moves(game_id: str):
+    """
+    List every valid move, fewest turns (most points) first.
+
+    For "show all moves" views, heatmaps and analytics.
+
+    DSA Operations:
+    - Run labelling of empty cells per row/column
+    - Per-cell line-of-sight rays, intersected for each same-type pair
+    """
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        return await _offload(game_service.all_moves, game_state)
+
+
 @router.post("/game/{game_id}/shuffle")
-async def shuffle_board(game_id: str):
+async def shuffle_board(game_id: str, expected_version: Optional[int] = None,
+                        delta: bool = Depends(delta_requested),
+                        compact: bool = Depends(compact_requested)):
     """
     Manually shuffle the board (costs 1 life).
 
@@ -132,53 +419,264 @@ async def shuffle_board(game_id: str):
     - Fisher-Yates shuffle algorithm
     - In-place array manipulation
     """
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        _check_version(game_state, expected_version)
+
+        if game_state.game_over or game_state.victory:
+            raise HTTPException(status_code=400, detail="Game is already finished")
+
+        mark = game_service.mark(game_state)
+        success = await _offload(game_service.shuffle_board, game_state,
+                                 heavy=_is_heavy(game_state))
+        _save_game(game_id, game_state)
+
+        if not success:
+            raise HTTPException(status_code=400, detail="No pokemon to shuffle")
+
+        return {
+            "success": True,
+            "lives_remaining": game_state.board.lives,
+            **_state_payload(game_state, delta, mark, compact)
+        }
+
+
+@router.get("/game/{game_id}/events", response_model=List[GameEvent])
+async def list_events(game_id: str, since: int = Query(0, ge=0)):
+    """
+    Event log of a game (audit trail), from event `since` on.
+
+    Events: create, move, ice (cells thawed by a move), shuffle, undo, redo, clock.
+    """
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        log = game_state._log
+        if log is None:
+            raise HTTPException(status_code=404, detail="Game has no event log")
+        events = log.since(since)
+
+    return [GameEvent(seq=event.seq, kind=event.kind, at=event.at, data=event.data)
+            for event in events]
+
+
+@router.get("/game/{game_id}/replay", response_model=GameState)
+async def replay_game(game_id: str, seq: int = Query(..., ge=1)):
+    """
+    Rebuild the state of a game after its first `seq` events. Event 1
+    creates the game, so seq starts at 1 (0 is rejected with 422).
+
+    DSA Operations:
+    - Binary search for the nearest snapshot
+    - Replay of the events after it
+    """
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        try:
+            return await _offload(game_service.state_at, game_state, seq)
+        except ValueError as error:
+            raise HTTPException(status_code=404, detail=str(error))
 
-    game_state = games[game_id]
 
-    if game_state.game_over or game_state.victory:
-        raise HTTPException(status_code=400, detail="Game is already finished")
+async def _step_history(game_id: str, step, expected_version: Optional[int],
+                        delta: bool, compact: bool, empty_message: str) -> dict:
+    """Shared body of /undo and /redo."""
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        _check_version(game_state, expected_version)
 
-    success = game_service.shuffle_board(game_state)
+        if game_state.game_over or game_state.victory:
+            raise HTTPException(status_code=400, detail="Game is already finished")
 
-    if not success:
-        raise HTTPException(status_code=400, detail="No pokemon to shuffle")
+        mark = game_service.mark(game_state)
+        if not step(game_state):
+            raise HTTPException(status_code=400, detail=empty_message)
+        _save_game(game_id, game_state)
+
+        return {
+            "success": True,
+            "can_undo": bool(game_state._undo),
+            "can_redo": bool(game_state._redo),
+            **_state_payload(game_state, delta, mark, compact)
+        }
+
+
+@router.post("/game/{game_id}/undo")
+async def undo_move(game_id: str, expected_version: Optional[int] = None,
+                    delta: bool = Depends(delta_requested),
+                    compact: bool = Depends(compact_requested)):
+    """
+    Take back the last move (only moves made since the last shuffle).
+
+    DSA Operations:
+    - Stack of reversible move records
+    - O(1) revert: two cells refilled, thawed ice refrozen, points removed
+    """
+    return await _step_history(game_id, game_service.undo, expected_version, delta,
+                               compact, "Nothing to undo")
+
+
+@router.post("/game/{game_id}/redo")
+async def redo_move(game_id: str, expected_version: Optional[int] = None,
+                    delta: bool = Depends(delta_requested),
+                    compact: bool = Depends(compact_requested)):
+    """Play the last undone move again (O(1) from its move record)."""
+    return await _step_history(game_id, game_service.redo, expected_version, delta,
+                               compact, "Nothing to redo")
+
+
+@router.get("/game/{game_id}/solvable", response_model=SolveResult)
+async def check_solvable(game_id: str,
+                         max_nodes: int = Query(50_000, ge=1, le=500_000),
+                         time_limit_ms: float = Query(500.0, gt=0, le=5000.0)):
+    """
+    Check whether the board can still be cleared completely.
+
+    DSA Operations:
+    - DFS over move sequences
+    - Zobrist hashing + transposition table
+    - Sleep-set pruning of independent move orderings
+
+    Returns the winning move sequence when one is found; solvable is null
+    if the search budget ran out.
+    """
+    async with game_locks(game_id):
+        return await _offload(game_service.solve, _load_game(game_id), max_nodes=max_nodes,
+                              time_limit_ms=time_limit_ms)
+
+
+@router.get("/game/{game_id}/time")
+async def get_time(game_id: str):
+    """
+    Read the game clock.
+
+    The clock runs on the server: remaining time is derived from the time
+    the clock was last synced, on every read and move. Clients only need
+    this to resync a local countdown display.
+    """
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
 
     return {
-        "success": True,
-        "lives_remaining": game_state.board.lives,
-        "game_state": game_state
+        "time_remaining": game_state.board.time_remaining,
+        "clock_running": game_state.clock_synced_at is not None,
+        "game_over": game_state.game_over
     }
 
 
-@router.post("/game/{game_id}/time")
-async def update_time(game_id: str, seconds_elapsed: int):
-    """Update game time."""
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
+@router.post("/game/{game_id}/pause")
+async def pause_game(game_id: str):
+    """
+    Stop the game clock. A game gets GameService.max_pauses pauses; a pause
+    ends by itself after max_pause_seconds.
+    """
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        if not game_service.pause_clock(game_state):
+            raise HTTPException(status_code=400, detail="No pauses left")
+        _save_game(game_id, game_state)
+
+    return {
+        "time_remaining": game_state.board.time_remaining,
+        "clock_running": False,
+        "pauses_left": game_service.max_pauses - game_state.pauses
+    }
 
-    game_state = games[game_id]
-    game_service.update_time(game_state, seconds_elapsed)
+
+@router.post("/game/{game_id}/resume")
+async def resume_game(game_id: str):
+    """Restart the game clock after a pause."""
+    async with game_locks(game_id):
+        game_state = _load_game(game_id)
+        game_service.resume_clock(game_state)
+        _save_game(game_id, game_state)
 
     return {
         "time_remaining": game_state.board.time_remaining,
-        "game_over": game_state.game_over
+        "clock_running": game_state.clock_synced_at is not None
     }
 
 
 @router.delete("/game/{game_id}")
 async def delete_game(game_id: str):
     """Delete a game."""
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Game not found")
+    async with game_locks(game_id):
+        if not games.delete(game_id):
+            raise HTTPException(status_code=404, detail="Game not found")
 
-    del games[game_id]
     return {"message": "Game deleted successfully"}
 
 
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Backpressure metrics of the work pool: queue depth, rejections and
+    recent queue-wait / run-time percentiles.
+    """
+    return {
+        "work_pool": work_pool.metrics(),
+        "active_game_locks": len(game_locks)
+    }
+
+
+# The catalogue only changes with a deploy; clients revalidate with the ETag
+POKEMON_CACHE_CONTROL = "public, max-age=86400"
+# Content-hashed URLs never change meaning
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    True if Accept-Encoding gives gzip a q-value above 0. An explicit gzip
+    entry decides; * only applies when gzip is not listed.
+    """
+    weights = {}
+    for part in (accept_encoding or "").split(","):
+        coding, *params = part.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.strip().lower()] = q
+    return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+
+def _etag_matches(if_none_match: Optional[str], *etags: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or any(etag in candidates for etag in etags)
+
+
+def _encoded_response(body: EncodedBody, accept_encoding: Optional[str],
+                      if_none_match: Optional[str], cache_control: str) -> Response:
+    """
+    Serve a pre-encoded JSON body: gzipped if the client accepts it, 304 Not
+    Modified if If-None-Match holds its ETag.
+    """
+    gzipped = _accepts_gzip(accept_encoding)
+    headers = {
+        "ETag": body.gzip_etag if gzipped else body.etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+
+    if _etag_matches(if_none_match, body.etag, body.gzip_etag):
+        return Response(status_code=304, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=body.gzipped, media_type="application/json", headers=headers)
+    return Response(content=body.body, media_type="application/json", headers=headers)
+
+
 @router.get("/pokemon")
-async def get_pokemon_data():
+async def get_pokemon_data(accept_encoding: Optional[str] = Header(None),
+                           if_none_match: Optional[str] = Header(None)):
     """
     Get all Pokemon data with sprite URLs.
 
@@ -187,5 +685,39 @@ async def get_pokemon_data():
     - Pokemon name
     - Pokedex ID
     - Sprite URL from PokeAPI
+
+    The body is serialized and gzipped once at import; a request only picks
+    the encoding. A matching If-None-Match gets 304 Not Modified.
     """
-    return {"pokemon": get_all_pokemon_data()}
+    return _encoded_response(CATALOGUE_RESPONSE, accept_encoding, if_none_match,
+                             POKEMON_CACHE_CONTROL)
+
+
+@router.get("/sprites/atlas.json")
+async def get_sprite_atlas(accept_encoding: Optional[str] = Header(None),
+                           if_none_match: Optional[str] = Header(None)):
+    """
+    Coordinate map of the sprite atlas: the hashed image name (relative to
+    this URL) and each pokemon's rectangle in it. Revalidated on every use,
+    so a rebuilt atlas is picked up at once. 404 if no atlas was built.
+    """
+    if sprite_atlas is None:
+        raise HTTPException(status_code=404, detail="Sprite atlas not built")
+    return _encoded_response(sprite_atlas.manifest, accept_encoding, if_none_match, "no-cache")
+
+
+@router.get("/sprites/{name}")
+async def get_sprite_image(name: str, if_none_match: Optional[str] = Header(None)):
+    """
+    The atlas image, streamed from its memory mapping. The name holds the
+    content hash, so it is cached for a year without revalidation.
+    """
+    if sprite_atlas is None or name != sprite_atlas.image_name:
+        raise HTTPException(status_code=404, detail="Sprite not found")
+
+    headers = {"ETag": sprite_atlas.etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if _etag_matches(if_none_match, sprite_atlas.etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Length"] = str(len(sprite_atlas))
+    return StreamingResponse(sprite_atlas.chunks(), media_type="image/png", headers=headers)
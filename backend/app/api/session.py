@@ -0,0 +1,231 @@
+"""
+WebSocket game sessions for Pikachu Kawaii game.
+
+One connection per game at `/api/game/{game_id}/ws`. The game is looked up
+once and stays bound to the connection; every reply carries a compact
+GameDelta instead of the full state.
+
+Protocol (JSON text frames):
+
+Client -> server
+- {"type": "move", "pos1": {...}, "pos2": {...}}
+- {"type": "hint"}
+- {"type": "shuffle"}
+- {"type": "undo"} / {"type": "redo"}
+- {"type": "sync", "since": <version>}  (resend changes after a version)
+Any message may carry "id" (echoed in the reply) and "expected_version"
+(rejected with a "conflict" error if the game has moved on).
+
+Server -> client
+- {"type": "state", "game_state": {...}}  full snapshot
+- {"type": "delta", "delta": {...}}  changes after a version
+- {"type": "move" | "shuffle" | "undo" | "redo", ..., "delta": {...}}  result + changes
+- {"type": "hint", "hint_available": bool, "pos1", "pos2"}
+- {"type": "clock", "time_remaining": int, "game_over": bool}
+- {"type": "error", "detail": str}
+
+Resuming: reconnect with `?since=<last version seen>`. The session opens with
+a delta from that version, or a full snapshot if it is too old.
+
+`?format=compact` sends full snapshots as CompactGameState (grid packed into
+one base64 string), like Accept: COMPACT_MEDIA_TYPE over HTTP.
+"""
+
+import asyncio
+import json
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from ..models.game import GameState, MoveRequest
+from .routes import (
+    game_locks, game_service, games, _check_version, _is_heavy, _load_game,
+    _offload, _play_move, _save_game, _snapshot
+)
+
+
+router = APIRouter()
+
+# Seconds between clock pushes while a session is open
+CLOCK_PUSH_SECONDS = float(os.getenv("WS_CLOCK_SECONDS", "1"))
+
+
+class GameSession:
+    """State of one WebSocket connection bound to one game."""
+
+    def __init__(self, websocket: WebSocket, game_id: str, game_state: GameState,
+                 compact: bool = False):
+        self.websocket = websocket
+        self.game_id = game_id
+        self.game_state = game_state
+        self.compact = compact
+        # Replies and clock pushes come from two tasks; keep frames whole
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, message: dict) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(message))
+
+    def _bound_game(self) -> GameState:
+        """
+        The bound game, rebound if the store now holds a different object
+        (reloaded after eviction). Raises 404 if the game was deleted.
+        """
+        game_state = games.get(self.game_id)
+        if game_state is None:
+            raise HTTPException(status_code=404, detail="Game not found")
+        if game_state is not self.game_state:
+            self.game_state = game_state
+        if game_service.tick(game_state):
+            _save_game(self.game_id, game_state)
+        return game_state
+
+    def _changes(self, since: Optional[int] = None, mark=None) -> dict:
+        """Delta after `since` / `mark`, or a full snapshot if unavailable."""
+        changes = game_service.delta(self.game_state, since=since, mark=mark)
+        if changes is not None:
+            return {"delta": changes.model_dump()}
+        return {"game_state": self._snapshot()}
+
+    def _snapshot(self) -> dict:
+        return _snapshot(self.game_state, self.compact).model_dump(mode="json")
+
+    async def open(self, since: Optional[int]) -> None:
+        async with game_locks(self.game_id):
+            if since is not None:
+                payload = self._changes(since=since)
+            else:
+                payload = {"game_state": self._snapshot()}
+        await self.send({"type": "delta" if "delta" in payload else "state", **payload})
+
+    async def handle(self, message: dict) -> dict:
+        """Process one client message and build the reply."""
+        kind = message.get("type")
+
+        async with game_locks(self.game_id):
+            game_state = self._bound_game()
+            _check_version(game_state, message.get("expected_version"))
+
+            if kind == "sync":
+                since = message.get("since")
+                payload = self._changes(since=since if isinstance(since, int) else -1)
+                return {"type": "delta" if "delta" in payload else "state", **payload}
+
+            if kind not in ("move", "hint", "shuffle", "undo", "redo"):
+                raise HTTPException(status_code=400, detail=f"Unknown message type: {kind}")
+
+            if game_state.game_over or game_state.victory:
+                raise HTTPException(status_code=400, detail="Game is already finished")
+
+            if kind == "hint":
+                hint = await _offload(game_service.find_hint, game_state)
+                if hint is None:
+                    return {"type": "hint", "hint_available": False}
+                return {
+                    "type": "hint",
+                    "hint_available": True,
+                    "pos1": hint[0].model_dump(),
+                    "pos2": hint[1].model_dump()
+                }
+
+            mark = game_service.mark(game_state)
+
+            if kind in ("undo", "redo"):
+                step = game_service.undo if kind == "undo" else game_service.redo
+                success = step(game_state)
+                if success:
+                    _save_game(self.game_id, game_state)
+                return {"type": kind, "success": success, **self._changes(mark=mark)}
+
+            if kind == "shuffle":
+                success = await _offload(game_service.shuffle_board, game_state,
+                                         heavy=_is_heavy(game_state))
+                _save_game(self.game_id, game_state)
+                return {"type": "shuffle", "success": success, **self._changes(mark=mark)}
+
+            move = MoveRequest.model_validate(message)
+            success, result = await _offload(_play_move, game_state, move,
+                                             heavy=_is_heavy(game_state))
+            _save_game(self.game_id, game_state)
+            reply = {"type": "move", "success": success}
+            if success:
+                reply["path"] = [pos.model_dump() for pos in result.path]
+                reply["turns"] = result.turns
+            return {**reply, **self._changes(mark=mark)}
+
+    async def push_clock(self) -> None:
+        """
+        Push the server clock whenever it changes, until the game ends, the
+        connection closes or the game is deleted. Clock transitions (time
+        running out) are saved by _bound_game.
+        """
+        last = None
+        while True:
+            await asyncio.sleep(CLOCK_PUSH_SECONDS)
+            async with game_locks(self.game_id):
+                try:
+                    game_state = self._bound_game()
+                except HTTPException as error:
+                    if error.status_code == 409:
+                        continue  # Another worker changed the game; rebind next time
+                    await self.send({"type": "error", "detail": error.detail})
+                    return
+                tick = (game_state.board.time_remaining, game_state.game_over)
+                finished = game_state.game_over or game_state.victory
+
+            if tick != last:
+                last = tick
+                await self.send({"type": "clock", "time_remaining": tick[0], "game_over": tick[1]})
+            if finished:
+                return
+
+
+@router.websocket("/game/{game_id}/ws")
+async def game_session(websocket: WebSocket, game_id: str, since: Optional[int] = None,
+                       format: Optional[str] = Query(None, pattern="^(full|compact)$")):
+    """
+    Game session over one WebSocket connection (see module docstring).
+
+    DSA Operations:
+    - Same move/hint/shuffle operations as the HTTP routes
+    - Change-stamp deltas instead of full board snapshots
+    """
+    await websocket.accept()
+
+    try:
+        async with game_locks(game_id):
+            game_state = _load_game(game_id)
+    except HTTPException as error:
+        await websocket.send_text(json.dumps({"type": "error", "detail": error.detail}))
+        await websocket.close(code=4404)
+        return
+
+    session = GameSession(websocket, game_id, game_state, compact=format == "compact")
+    await session.open(since)
+    clock = asyncio.create_task(session.push_clock())
+
+    try:
+        while True:
+            message = {}
+            try:
+                message = json.loads(await websocket.receive_text())
+                if not isinstance(message, dict):
+                    message = {}
+                    raise ValueError("Message must be a JSON object")
+                reply = await session.handle(message)
+            except HTTPException as error:
+                reply = {"type": "conflict" if error.status_code == 409 else "error",
+                         "detail": error.detail}
+            except (ValueError, ValidationError) as error:
+                reply = {"type": "error", "detail": str(error)}
+
+            if "id" in message:
+                reply["id"] = message["id"]
+            await session.send(reply)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Stop the clock task and retrieve its outcome (a send to a closed
+        # socket raises there)
+        clock.cancel()
+        await asyncio.gather(clock, return_exceptions=True)
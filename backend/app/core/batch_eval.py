@@ -0,0 +1,193 @@
+"""
+Vectorized batch evaluation of many boards at once (offline tuning).
+
+Key DSA Concepts:
+1. Prefix sums - Occupied cells in any row/column segment in O(1)
+2. Running max/min - Every cell's line-of-sight rays in one pass
+3. Vectorization - One NumPy expression evaluates all boards x pairs x lines
+4. Chunking - Boards are processed in blocks to bound memory
+
+Every path with at most 2 turns has a middle segment along some padded row
+(or column) k, joined to both cells by straight legs along their columns
+(rows); legs and middle may have length 0, which covers the direct and L
+shapes. A leg exists iff k lies within the cell's ray (reach interval) along
+that axis, computed for all cells at once with running max/min. Candidate
+pairs (same pokemon, not frozen) are gathered from all boards of a chunk
+into one flat list of (board, cell, cell) triples; for each triple and each
+k the rays are compared and the middle segment is checked with a prefix-sum
+difference. The answers match find_path_simple.
+
+NumPy is optional: it is only needed by this module, which the game server
+does not import. It is listed in requirements-tools.txt for offline tools.
+"""
+
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+class BatchResult(NamedTuple):
+    move_counts: "np.ndarray"  # (N,) number of valid moves per board
+    dead: "np.ndarray"  # (N,) True if a non-empty board has no valid move
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Batch evaluation needs NumPy: pip install -r requirements-tools.txt")
+
+
+def stack_boards(boards: Iterable) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Stack CompactBoards (or GameStates) into arrays for evaluate_boards.
+
+    Returns (ids, frozen), both shaped (N, rows, cols); id 0 = empty.
+    """
+    _require_numpy()
+    ids, frozen = [], []
+    for board in boards:
+        board = getattr(board, "_compact", None) or board
+        padded_ids = np.frombuffer(bytes(board.ids), dtype=np.uint8)
+        padded_frozen = np.frombuffer(bytes(board.frozen), dtype=np.uint8)
+        shape = (board.rows + 2, board.width)
+        ids.append(padded_ids.reshape(shape)[1:-1, 1:-1])
+        frozen.append(padded_frozen.reshape(shape)[1:-1, 1:-1])
+    return np.stack(ids), np.stack(frozen).astype(bool)
+
+
+def evaluate_boards(ids: "np.ndarray", frozen: Optional["np.ndarray"] = None,
+                    chunk_elements: int = 4_000_000) -> BatchResult:
+    """
+    Count the valid moves of every board in a stack.
+
+    Args:
+        ids: (N, rows, cols) pokemon ids, 0 = empty
+        frozen: (N, rows, cols) ice flags (frozen cells block and cannot be
+                selected), or None
+        chunk_elements: Rough cap on the size of one intermediate array
+
+    Time Complexity: O(N * P) to find candidates, P = cell pairs, then
+                     O(T * (rows + cols)) for T candidate pairs, vectorized
+    """
+    _require_numpy()
+    ids = np.asarray(ids)
+    count, rows, cols = ids.shape
+    if frozen is None:
+        frozen = np.zeros(ids.shape, dtype=bool)
+
+    height, width = rows + 2, cols + 2
+    padded = np.zeros((count, height, width), dtype=np.int32)
+    padded[:, 1:-1, 1:-1] = ids
+    padded_frozen = np.zeros((count, height, width), dtype=bool)
+    padded_frozen[:, 1:-1, 1:-1] = frozen
+
+    # All cell pairs a < b of the inner board (padded coordinates)
+    inner = np.array([(r, c) for r in range(1, rows + 1) for c in range(1, cols + 1)])
+    first, second = np.triu_indices(len(inner), k=1)
+    r1, c1 = inner[first, 0], inner[first, 1]
+    r2, c2 = inner[second, 0], inner[second, 1]
+    flat1, flat2 = r1 * width + c1, r2 * width + c2
+
+    move_counts = np.zeros(count, dtype=np.int64)
+    step = max(1, chunk_elements // max(1, len(first)))
+
+    for start in range(0, count, step):
+        block = padded[start:start + step]
+        block_frozen = padded_frozen[start:start + step]
+        flat = block.reshape(len(block), -1)
+        flat_frozen = block_frozen.reshape(len(block), -1)
+
+        # Candidate pairs: same pokemon, neither frozen -> flat triples
+        id1, id2 = flat[:, flat1], flat[:, flat2]
+        candidate = (id1 == id2) & (id1 > 0) & ~flat_frozen[:, flat1] & ~flat_frozen[:, flat2]
+        board_of, pair_of = np.nonzero(candidate)
+        if len(board_of) == 0:
+            continue
+
+        pr1, pc1, pr2, pc2 = r1[pair_of], c1[pair_of], r2[pair_of], c2[pair_of]
+        occupied = block != 0
+
+        # row_sum[b, r, c] = occupied cells in row r left of column c
+        row_sum = np.zeros((len(block), height, width + 1), dtype=np.int32)
+        np.cumsum(occupied, axis=2, out=row_sum[:, :, 1:])
+        # col_sum[b, c, r] = occupied cells in column c above row r
+        col_sum = np.zeros((len(block), width, height + 1), dtype=np.int32)
+        np.cumsum(occupied.transpose(0, 2, 1), axis=2, out=col_sum[:, :, 1:])
+
+        up, down = _reach(occupied, axis=1)
+        left, right = _reach(occupied, axis=2)
+
+        cell1 = (board_of * height + pr1) * width + pc1
+        cell2 = (board_of * height + pr2) * width + pc2
+        linked = (_middle_lines(row_sum, board_of, pc1, pc2,
+                                up.take(cell1), down.take(cell1),
+                                up.take(cell2), down.take(cell2)) |
+                  _middle_lines(col_sum, board_of, pr1, pr2,
+                                left.take(cell1), right.take(cell1),
+                                left.take(cell2), right.take(cell2)))
+        move_counts[start:start + len(block)] = np.bincount(
+            board_of, weights=linked, minlength=len(block)).astype(np.int64)
+
+    nonempty = (ids != 0).reshape(count, -1).any(axis=1)
+    return BatchResult(move_counts=move_counts, dead=nonempty & (move_counts == 0))
+
+
+def _reach(occupied: "np.ndarray", axis: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Ray extents of every cell along `axis` (1 = columns, 2 = rows).
+
+    low[b, r, c] / high[b, r, c]: the first and last line index such that all
+    cells strictly between them and the cell are empty, i.e. the nearest
+    occupied cell on each side + 1 / - 1 (0 / last line at the border).
+    Returned flattened, for np.take with flat cell indices.
+    """
+    lines = occupied.shape[axis]
+    shape = [1, 1, 1]
+    shape[axis] = lines
+    position = np.arange(lines, dtype=np.int32).reshape(shape)
+
+    # Nearest occupied line at or before / at or after each cell
+    before = np.maximum.accumulate(np.where(occupied, position, -1), axis=axis)
+    after = np.flip(np.minimum.accumulate(
+        np.flip(np.where(occupied, position, lines), axis=axis), axis=axis), axis=axis)
+
+    # Strictly before / after: shift by one line
+    low = np.zeros_like(before)
+    high = np.full_like(after, lines - 1)
+    if axis == 1:
+        low[:, 1:] = before[:, :-1] + 1
+        high[:, :-1] = after[:, 1:] - 1
+    else:
+        low[:, :, 1:] = before[:, :, :-1] + 1
+        high[:, :, :-1] = after[:, :, 1:] - 1
+    return low.ravel(), high.ravel()
+
+
+def _middle_lines(mid_sum, board, pos1, pos2, low1, high1, low2, high2) -> "np.ndarray":
+    """
+    Candidate pairs joined through a middle segment on some line k.
+
+    With mid_sum = row_sum and column reaches: both cells walk their column
+    to row k (k within both reach intervals), and row k must be empty
+    strictly between columns pos1 and pos2. The other call covers middle
+    columns.
+
+    Returns (T,) booleans, one per (board, a, b) triple.
+    """
+    # int32 index math: half the memory traffic of NumPy's default int64
+    _, lines, line_len = mid_sum.shape
+    k = np.arange(lines, dtype=np.int32)[None, :]  # (1, K)
+    board = board.astype(np.int32)[:, None]  # (T, 1)
+    low = np.minimum(pos1, pos2).astype(np.int32)[:, None]
+    high = np.maximum(pos1, pos2).astype(np.int32)[:, None]
+    first = np.maximum(low1, low2)[:, None]
+    last = np.minimum(high1, high2)[:, None]
+
+    # Middle: cells strictly between the two legs on line k
+    mids = mid_sum.ravel()
+    row_base = (board * lines + k) * line_len
+    middle = mids.take(row_base + high) - mids.take(row_base + low + 1)
+
+    return ((k >= first) & (k <= last) & (middle <= 0)).any(axis=1)
@@ -0,0 +1,382 @@
+"""
+Compact board representation for Pikachu Kawaii game.
+
+Key DSA Concepts:
+1. Flat arrays (bytearray) - Cache-friendly storage, O(1) indexed access
+2. Padded grid - A virtual empty ring around the board removes bounds checks
+3. Dirty set - Only changed cells are written back to the API schema
+   Change log - Version stamp of the last change of each cell, for deltas
+4. Bitboards - One occupancy bitmask per row and per column
+5. Hash Map - Pokemon id -> set of cell indices, plus a remaining-tile counter
+6. Reversible records - A move is undone / redone from a MoveRecord in
+   O(1), or O(slides) when gravity moved tiles (see app/core/rules.py)
+
+The pydantic `GameBoard.grid` (List[List[Cell]]) is the API schema. Internally
+the service and the pathfinder work on `CompactBoard`, where a cell is a single
+integer index into three parallel byte arrays. Board position (row, col) maps to
+index (row + 1) * width + (col + 1) with width = cols + 2.
+
+`row_bits[r]` has bit c set when padded cell (r, c) is not empty, and
+`col_bits[c]` has bit r set. Both are kept in sync by `place` and `clear`,
+as are `positions` (pokemon id -> indices, ice included) and `remaining`.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+from ..models.game import Cell, CellType, Position
+
+
+# Cell kind codes stored in `CompactBoard.kinds`
+EMPTY = 0
+POKEMON = 1
+ICE = 2
+
+_KIND_CODES = {CellType.EMPTY: EMPTY, CellType.POKEMON: POKEMON, CellType.ICE: ICE}
+_KIND_TYPES = {code: cell_type for cell_type, code in _KIND_CODES.items()}
+
+# Packed cell bytes (to_bytes / from_bytes): pokemon id in the low 7 bits
+# (0 = empty, ICE_BYTE = ice block), FROZEN_BIT if covered by ice
+ICE_BYTE = 0x7F
+FROZEN_BIT = 0x80
+
+# bytes.translate tables unpacking one packed byte into each array
+_UNPACK_IDS = bytes(0 if b & ICE_BYTE == ICE_BYTE else b & ICE_BYTE for b in range(256))
+_UNPACK_FROZEN = bytes(b >> 7 for b in range(256))
+_UNPACK_KINDS = bytes(EMPTY if b & ICE_BYTE == 0 else ICE if b & ICE_BYTE == ICE_BYTE else POKEMON
+                      for b in range(256))
+
+
+class MoveRecord(NamedTuple):
+    """Everything needed to undo or redo one move without copying the board."""
+    cells: Tuple[int, int]  # The two cleared cells
+    ids: Tuple[int, int]  # Pokemon ids they held
+    thawed: Tuple[int, ...]  # Cells whose ice the move removed
+    score_delta: int = 0
+    slides: Tuple[Tuple[int, int], ...] = ()  # (from, to) tile moves made by gravity
+
+
+class CompactBoard:
+    """
+    Array-backed board with a one-cell empty border.
+
+    Space Complexity: O((rows + 2) * (cols + 2)) bytes per array
+    """
+
+    __slots__ = ("rows", "cols", "width", "kinds", "ids", "frozen",
+                 "row_bits", "col_bits", "positions", "remaining", "dirty",
+                 "stamp", "changed_at", "tracked_from")
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.width = cols + 2
+
+        size = (rows + 2) * self.width
+        self.kinds = bytearray(size)   # EMPTY / POKEMON / ICE
+        self.ids = bytearray(size)     # pokemon id, 0 when none
+        self.frozen = bytearray(size)  # 1 if covered by ice
+
+        # Occupancy bitboards in padded coordinates (border bits stay 0)
+        self.row_bits: List[int] = [0] * (rows + 2)
+        self.col_bits: List[int] = [0] * self.width
+
+        # Live position index per pokemon type and number of pokemon left
+        self.positions: Dict[int, Set[int]] = {}
+        self.remaining = 0
+
+        # Indices changed since the last flush to the pydantic grid
+        self.dirty: Set[int] = set()
+
+        # Board version given to new changes, the version at which each cell
+        # last changed, and the oldest version deltas can be computed from
+        self.stamp = 0
+        self.changed_at: Dict[int, int] = {}
+        self.tracked_from = 0
+
+    # ------------------------------------------------------------------
+    # Coordinates
+    # ------------------------------------------------------------------
+
+    def index(self, row: int, col: int) -> int:
+        """Map a board position (border ring included) to a flat index."""
+        return (row + 1) * self.width + col + 1
+
+    def row_col(self, idx: int) -> tuple:
+        """Map a flat index back to a (row, col) board position."""
+        row, col = divmod(idx, self.width)
+        return row - 1, col - 1
+
+    def position(self, idx: int) -> Position:
+        row, col = self.row_col(idx)
+        return Position(row=row, col=col)
+
+    def is_inside(self, row: int, col: int) -> bool:
+        """Check if position is within board boundaries (border excluded)."""
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def cells(self) -> Iterator[int]:
+        """Iterate over the indices of all real cells in row-major order."""
+        width = self.width
+        for row in range(1, self.rows + 1):
+            start = row * width + 1
+            yield from range(start, start + self.cols)
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def place(self, idx: int, pokemon_id: int, frozen: bool = False) -> None:
+        """Put a pokemon on a cell (replacing any pokemon already there)."""
+        if self.kinds[idx] == POKEMON:
+            self.positions[self.ids[idx]].discard(idx)
+        else:
+            self.remaining += 1
+        self.positions.setdefault(pokemon_id, set()).add(idx)
+
+        self.kinds[idx] = POKEMON
+        self.ids[idx] = pokemon_id
+        self.frozen[idx] = 1 if frozen else 0
+        self._set_occupied(idx)
+        self.dirty.add(idx)
+        self.changed_at[idx] = self.stamp
+
+    def clear(self, idx: int) -> None:
+        """Make a cell empty."""
+        if self.kinds[idx] == POKEMON:
+            self.positions[self.ids[idx]].discard(idx)
+            self.remaining -= 1
+
+        self.kinds[idx] = EMPTY
+        self.ids[idx] = 0
+        self.frozen[idx] = 0
+        row, col = divmod(idx, self.width)
+        self.row_bits[row] &= ~(1 << col)
+        self.col_bits[col] &= ~(1 << row)
+        self.dirty.add(idx)
+        self.changed_at[idx] = self.stamp
+
+    def _set_occupied(self, idx: int) -> None:
+        row, col = divmod(idx, self.width)
+        self.row_bits[row] |= 1 << col
+        self.col_bits[col] |= 1 << row
+
+    def set_frozen(self, idx: int, frozen: bool) -> bool:
+        """Set the ice flag of a cell. Returns True if the flag changed."""
+        value = 1 if frozen else 0
+        if self.frozen[idx] == value:
+            return False
+        self.frozen[idx] = value
+        self.dirty.add(idx)
+        self.changed_at[idx] = self.stamp
+        return True
+
+    def move_tile(self, src: int, dst: int) -> None:
+        """Slide the pokemon on `src` (with its ice) onto the empty cell `dst` - O(1)."""
+        pokemon_id = self.ids[src]
+        frozen = self.frozen[src]
+        self.clear(src)
+        self.place(dst, pokemon_id, bool(frozen))
+
+    def remove_pair(self, a: int, b: int, score_delta: int = 0) -> MoveRecord:
+        """
+        Clear a matched pair and thaw the cells next to it (the border ring is
+        never frozen). Returns the record that undoes it - O(1).
+        """
+        ids = (self.ids[a], self.ids[b])
+        self.clear(a)
+        self.clear(b)
+
+        width = self.width
+        thawed = tuple(neighbor
+                       for idx in (a, b)
+                       for neighbor in (idx + 1, idx + width, idx - 1, idx - width)
+                       if self.set_frozen(neighbor, False))
+        return MoveRecord((a, b), ids, thawed, score_delta)
+
+    def undo_move(self, record: MoveRecord) -> None:
+        """Slide tiles back, put a removed pair back and refreeze the cells it thawed."""
+        for src, dst in reversed(record.slides):
+            self.move_tile(dst, src)
+        for idx, pokemon_id in zip(record.cells, record.ids):
+            self.place(idx, pokemon_id)
+        for idx in record.thawed:
+            self.set_frozen(idx, True)
+
+    def redo_move(self, record: MoveRecord) -> None:
+        """Apply an undone move again, gravity slides included."""
+        for idx in record.cells:
+            self.clear(idx)
+        for idx in record.thawed:
+            self.set_frozen(idx, False)
+        for src, dst in record.slides:
+            self.move_tile(src, dst)
+
+    def copy(self) -> "CompactBoard":
+        """Independent copy of the board and its indexes - O(rows * cols)."""
+        board = CompactBoard.__new__(CompactBoard)
+        board.rows = self.rows
+        board.cols = self.cols
+        board.width = self.width
+        board.kinds = bytearray(self.kinds)
+        board.ids = bytearray(self.ids)
+        board.frozen = bytearray(self.frozen)
+        board.row_bits = list(self.row_bits)
+        board.col_bits = list(self.col_bits)
+        board.positions = {pokemon_id: set(cells) for pokemon_id, cells in self.positions.items()}
+        board.remaining = self.remaining
+        board.dirty = set()
+        board.stamp = self.stamp
+        board.changed_at = dict(self.changed_at)
+        board.tracked_from = self.tracked_from
+        return board
+
+    # ------------------------------------------------------------------
+    # Conversion to / from the API schema
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_grid(cls, grid: List[List[Cell]], rows: int, cols: int) -> "CompactBoard":
+        """Build a compact board from a pydantic grid - O(rows * cols)."""
+        board = cls(rows, cols)
+        width = board.width
+
+        for row in range(rows):
+            base = (row + 1) * width + 1
+            for col, cell in enumerate(grid[row]):
+                idx = base + col
+                kind = _KIND_CODES[cell.type]
+                board.kinds[idx] = kind
+                board.ids[idx] = cell.pokemon_id or 0
+                board.frozen[idx] = 1 if cell.is_frozen else 0
+                if kind != EMPTY:
+                    board._set_occupied(idx)
+                if kind == POKEMON:
+                    board.positions.setdefault(cell.pokemon_id, set()).add(idx)
+                    board.remaining += 1
+
+        return board
+
+    @classmethod
+    def from_arrays(cls, rows: int, cols: int, kinds: bytes, ids: bytes,
+                    frozen: bytes) -> "CompactBoard":
+        """Build a compact board from copies of its three arrays - O(size)."""
+        board = cls(rows, cols)
+        board.kinds[:] = kinds
+        board.ids[:] = ids
+        board.frozen[:] = frozen
+
+        for idx, kind in enumerate(board.kinds):
+            if kind != EMPTY:
+                board._set_occupied(idx)
+            if kind == POKEMON:
+                board.positions.setdefault(board.ids[idx], set()).add(idx)
+                board.remaining += 1
+
+        return board
+
+    def to_bytes(self) -> bytes:
+        """
+        The board packed as one byte per cell, row-major, border excluded:
+        the pokemon id (0 = empty, ICE_BYTE = ice block), plus FROZEN_BIT
+        if frozen. Pokemon ids must be below ICE_BYTE.
+
+        The id and ice arrays are combined as two big integers (ice flags
+        are 0/1, so `<< 7` moves each onto bit 7 of its own byte) instead
+        of cell by cell. Time Complexity: O(rows * cols)
+        """
+        size = len(self.ids)
+        packed = (int.from_bytes(self.ids, "big") |
+                  int.from_bytes(self.frozen, "big") << 7).to_bytes(size, "big")
+
+        if ICE in self.kinds:
+            packed = bytearray(packed)
+            for idx, kind in enumerate(self.kinds):
+                if kind == ICE:
+                    packed[idx] = ICE_BYTE | (FROZEN_BIT if self.frozen[idx] else 0)
+
+        width = self.width
+        return b"".join(packed[row * width + 1:row * width + 1 + self.cols]
+                        for row in range(1, self.rows + 1))
+
+    @classmethod
+    def from_bytes(cls, rows: int, cols: int, data: bytes) -> "CompactBoard":
+        """Build a compact board from `to_bytes` output - O(rows * cols)."""
+        if len(data) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cell bytes, got {len(data)}")
+
+        # Re-insert the empty border: a blank padded row, then per row
+        # one border byte on each side
+        width = cols + 2
+        edge = bytes(width)
+        padded = edge + b"".join(b"\0" + data[row * cols:(row + 1) * cols] + b"\0"
+                                 for row in range(rows)) + edge
+        return cls.from_arrays(rows, cols, padded.translate(_UNPACK_KINDS),
+                               padded.translate(_UNPACK_IDS), padded.translate(_UNPACK_FROZEN))
+
+    def to_cell(self, idx: int) -> Cell:
+        kind = self.kinds[idx]
+        return Cell(
+            type=_KIND_TYPES[kind],
+            pokemon_id=self.ids[idx] if kind != EMPTY else None,
+            is_frozen=bool(self.frozen[idx])
+        )
+
+    def to_grid(self) -> List[List[Cell]]:
+        """Build a full pydantic grid - O(rows * cols)."""
+        self.dirty.clear()
+        width = self.width
+        return [
+            [self.to_cell((row + 1) * width + col + 1) for col in range(self.cols)]
+            for row in range(self.rows)
+        ]
+
+    def flush(self, grid: List[List[Cell]]) -> None:
+        """Write only the cells changed since the last flush - O(changed cells)."""
+        for idx in self.dirty:
+            row, col = self.row_col(idx)
+            grid[row][col] = self.to_cell(idx)
+        self.dirty.clear()
+
+    def changes_since(self, version: int) -> Optional[List[int]]:
+        """
+        Indices of cells changed after `version`, in row-major order.
+
+        Returns None if changes that old are not tracked (the caller then needs
+        a full snapshot). Time Complexity: O(cells ever changed)
+        """
+        if version < self.tracked_from:
+            return None
+        return sorted(idx for idx, stamp in self.changed_at.items() if stamp > version)
+
+    def pokemon_at(self, idx: int) -> Optional[int]:
+        return self.ids[idx] if self.kinds[idx] == POKEMON else None
+
+    def pokemon_cells(self) -> List[int]:
+        """Indices of all remaining pokemon in row-major order - O(n log n)."""
+        return sorted(idx for cells in self.positions.values() for idx in cells)
+
+    def check_indexes(self) -> None:
+        """
+        Debug check: compare the incremental indexes with a full rescan.
+
+        Raises AssertionError on the first inconsistency.
+        """
+        positions: Dict[int, Set[int]] = {}
+        row_bits = [0] * (self.rows + 2)
+        col_bits = [0] * self.width
+
+        for idx in range(len(self.kinds)):
+            kind = self.kinds[idx]
+            if kind == EMPTY:
+                continue
+            row, col = divmod(idx, self.width)
+            row_bits[row] |= 1 << col
+            col_bits[col] |= 1 << row
+            if kind == POKEMON:
+                positions.setdefault(self.ids[idx], set()).add(idx)
+
+        live = {pokemon_id: cells for pokemon_id, cells in self.positions.items() if cells}
+        assert live == positions, "position index out of sync with the board"
+        assert self.remaining == sum(len(cells) for cells in positions.values()), \
+            "remaining-tile counter out of sync with the board"
+        assert self.row_bits == row_bits, "row bitboards out of sync with the board"
+        assert self.col_bits == col_bits, "column bitboards out of sync with the board"
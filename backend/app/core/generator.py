@@ -0,0 +1,88 @@
+"""
+Solvable board generation for Pikachu Kawaii game.
+
+Key DSA Concepts:
+1. Reverse construction - Build the board by "un-removing" connectable pairs
+2. Fisher-Yates shuffle - A random interleaving of the fill order, O(n)
+3. Invariant - Every empty cell keeps a clear line to one chosen edge
+
+Algorithm:
+1. Pick one edge of the board at random (top, bottom, left or right).
+2. Cut the board into lines perpendicular to that edge. Each line is filled
+   starting from the far side, so the empty cells of a line always form one
+   run that touches the chosen edge.
+3. Shuffle one token per cell, labelled with its line, and read the tokens two
+   at a time: each pair of tokens places one pokemon pair on the next free cell
+   of each of the two lines.
+
+When a pair is placed, both cells still see the chosen edge through empty
+cells (or are neighbours in the same line), so the pair is connectable in the
+board as it is at that moment. Removing the pairs in the reverse order of
+placement therefore always clears the board: every board built this way is
+solvable.
+
+Ice is only put on a cell that has a neighbour placed in a later pair. That
+neighbour is removed earlier, which thaws the cell before it is needed.
+
+Time Complexity: O(rows * cols)
+"""
+
+from typing import List
+from .board import CompactBoard
+
+
+def generate_solvable_board(rows: int, cols: int, pair_ids: List[int],
+                            num_ice: int, rng) -> CompactBoard:
+    """
+    Build a board that can be cleared completely.
+
+    Args:
+        rows, cols: Board size (rows * cols must equal 2 * len(pair_ids))
+        pair_ids: Pokemon id of every pair, in placement order
+        num_ice: Number of cells to cover with ice (capped by eligible cells)
+        rng: Random number generator (random.Random or the random module)
+    """
+    if rows * cols != 2 * len(pair_ids):
+        raise ValueError("Board must hold exactly two cells per pair")
+
+    board = CompactBoard(rows, cols)
+
+    # Lines ordered from the far side to the chosen edge
+    edge = rng.randrange(4)
+    if edge == 0:    # top: fill columns bottom-up
+        lines = [[board.index(row, col) for row in reversed(range(rows))] for col in range(cols)]
+    elif edge == 1:  # bottom: fill columns top-down
+        lines = [[board.index(row, col) for row in range(rows)] for col in range(cols)]
+    elif edge == 2:  # left: fill rows right-to-left
+        lines = [[board.index(row, col) for col in reversed(range(cols))] for row in range(rows)]
+    else:            # right: fill rows left-to-right
+        lines = [[board.index(row, col) for col in range(cols)] for row in range(rows)]
+
+    # One token per cell, labelled with its line; shuffle the fill order
+    tokens = [line for line, cells in enumerate(lines) for _ in cells]
+    for i in range(len(tokens) - 1, 0, -1):
+        j = rng.randint(0, i)
+        tokens[i], tokens[j] = tokens[j], tokens[i]
+
+    filled = [0] * len(lines)
+    placed_at = {}  # cell index -> placement step of its pair
+
+    for step, pokemon_id in enumerate(pair_ids):
+        for line in (tokens[2 * step], tokens[2 * step + 1]):
+            idx = lines[line][filled[line]]
+            filled[line] += 1
+            board.place(idx, pokemon_id)
+            placed_at[idx] = step
+
+    # Ice only where a neighbour is removed earlier (placed later)
+    if num_ice > 0:
+        width = board.width
+        eligible = [
+            idx for idx in board.cells()
+            if any(placed_at.get(neighbor, -1) > placed_at[idx]
+                   for neighbor in (idx + 1, idx + width, idx - 1, idx - width))
+        ]
+        for idx in rng.sample(eligible, min(num_ice, len(eligible))):
+            board.set_frozen(idx, True)
+
+    return board
@@ -0,0 +1,182 @@
+"""
+Incrementally maintained index of valid moves for Pikachu Kawaii game.
+
+Key DSA Concepts:
+1. Hash Set - The currently connectable pairs, O(1) "any move left?" check
+2. Hash Map - The board's pokemon id -> cell indices index, for same-type pairs
+3. Incremental update - Only pairs a change can affect are re-validated
+
+Why incremental updates are sound:
+- Clearing cells only removes obstacles, so every connectable pair that does
+  not use a cleared cell stays connectable.
+- A path with at most 2 turns that runs through a cleared cell X has a segment
+  in row X.row or in column X.col. Its first/last segments lie in the rows or
+  columns of the endpoints and its middle segment lies between them, so X.row
+  falls in the pair's row span or X.col falls in its column span. Pairs whose
+  spans miss every cleared cell cannot have changed.
+- Removing ice does not change any line of sight (the cell stays occupied); it
+  only makes pairs that contain the thawed cell selectable.
+- The span argument does not care whether X was emptied or filled, so after
+  gravity slides tiles (X = every cell a tile left or landed on) the pairs
+  whose spans hit X are re-validated, and dropped if they became blocked.
+- Rulesets allowing more than 2 turns break the span argument: there every
+  update is a full rebuild.
+
+A partial index (built with `seeded`) only holds pairs known to be valid, e.g.
+the pair planted by a shuffle. The same updates keep it a subset of the valid
+pairs, and it is completed with a full rebuild only once it runs empty.
+"""
+
+from typing import Iterable, Optional, Set, Tuple
+from .board import CompactBoard, MoveRecord
+from .rules import STANDARD, Ruleset
+
+
+class MoveIndex:
+    """
+    Set of connectable (idx1, idx2) pairs, idx1 < idx2, for one board.
+
+    Time Complexity:
+    - rebuild: one all-pairs sweep, O(W * H + same-type pairs * (rows + cols))
+    - cells_cleared / cells_changed: O(n^2) span tests + path checks for
+      affected pairs only
+    - first / has_moves: O(1) while the index is complete or non-empty
+    """
+
+    def __init__(self, board: CompactBoard, pathfinder_class, ruleset: Ruleset = STANDARD):
+        self.board = board
+        self.pathfinder = pathfinder_class(board, ruleset=ruleset)
+        self.valid: Set[Tuple[int, int]] = set()
+        self.complete = False  # True if `valid` holds every connectable pair
+        self.rebuild()
+
+    @classmethod
+    def seeded(cls, board: CompactBoard, pathfinder_class, pairs: Iterable[Tuple[int, int]],
+               ruleset: Ruleset = STANDARD) -> "MoveIndex":
+        """Partial index holding only `pairs`, which must be connectable."""
+        index = cls.__new__(cls)
+        index.board = board
+        index.pathfinder = pathfinder_class(board, ruleset=ruleset)
+        index.valid = {(a, b) if a < b else (b, a) for a, b in pairs}
+        index.complete = False
+        return index
+
+    def rebuild(self) -> None:
+        """Collect every valid pair with the pathfinder's all-pairs sweep."""
+        self.valid = {(a, b) for a, b, _ in self.pathfinder.all_pairs()}
+        self.complete = True
+
+    def _check(self, idx1: int, idx2: int) -> bool:
+        """Run the pathfinder on one pair and record it if connectable."""
+        board = self.board
+        if board.frozen[idx1] or board.frozen[idx2]:
+            return False
+
+        if self.pathfinder.connectable(idx1, idx2):
+            self.valid.add((idx1, idx2) if idx1 < idx2 else (idx2, idx1))
+            return True
+        return False
+
+    def cells_cleared(self, cleared: Iterable[int], thawed: Iterable[int] = ()) -> None:
+        """
+        Update the index after `cleared` cells became empty and `thawed`
+        cells lost their ice. Must be called after the board was mutated.
+        """
+        if self.pathfinder.ruleset.max_turns > 2:
+            self.rebuild()
+            return
+
+        board = self.board
+        width = board.width
+        cleared = set(cleared)
+        thawed = set(thawed)
+
+        # Drop every pair that used the removed pokemon
+        self.valid = {pair for pair in self.valid
+                      if pair[0] not in cleared and pair[1] not in cleared}
+
+        spots = [divmod(idx, width) for idx in cleared]
+
+        for cells in self.board.positions.values():
+            cells = sorted(cells)
+            for i in range(len(cells)):
+                a = cells[i]
+                ra, ca = divmod(a, width)
+                for j in range(i + 1, len(cells)):
+                    b = cells[j]
+                    if (a, b) in self.valid:
+                        continue
+
+                    if a in thawed or b in thawed:
+                        self._check(a, b)
+                        continue
+
+                    rb, cb = divmod(b, width)
+                    row_lo, row_hi = (ra, rb) if ra < rb else (rb, ra)
+                    col_lo, col_hi = (ca, cb) if ca < cb else (cb, ca)
+                    for row, col in spots:
+                        if row_lo <= row <= row_hi or col_lo <= col <= col_hi:
+                            self._check(a, b)
+                            break
+
+    def cells_changed(self, changed: Iterable[int], thawed: Iterable[int] = ()) -> None:
+        """
+        Update the index after `changed` cells were emptied or filled (gravity)
+        and `thawed` cells lost their ice. Pairs whose spans a changed cell
+        hits are re-validated both ways. Must be called after the board was
+        mutated.
+        """
+        if self.pathfinder.ruleset.max_turns > 2:
+            self.rebuild()
+            return
+
+        width = self.board.width
+        changed = set(changed)
+        thawed = set(thawed)
+
+        # Pairs holding a moved or removed tile are stale
+        valid = {pair for pair in self.valid
+                 if pair[0] not in changed and pair[1] not in changed}
+        self.valid = valid
+
+        spots = [divmod(idx, width) for idx in changed]
+
+        for cells in self.board.positions.values():
+            cells = sorted(cells)
+            for i in range(len(cells)):
+                a = cells[i]
+                ra, ca = divmod(a, width)
+                for j in range(i + 1, len(cells)):
+                    b = cells[j]
+                    if a in changed or b in changed or a in thawed or b in thawed:
+                        self._check(a, b)
+                        continue
+
+                    rb, cb = divmod(b, width)
+                    row_lo, row_hi = (ra, rb) if ra < rb else (rb, ra)
+                    col_lo, col_hi = (ca, cb) if ca < cb else (cb, ca)
+                    for row, col in spots:
+                        if row_lo <= row <= row_hi or col_lo <= col <= col_hi:
+                            # A filled cell may block a pair that was valid
+                            valid.discard((a, b))
+                            self._check(a, b)
+                            break
+
+    def move_played(self, record: MoveRecord) -> None:
+        """Update the index after the move of `record` was applied to the board."""
+        if record.slides:
+            moved = {idx for slide in record.slides for idx in slide}
+            self.cells_changed(moved.union(record.cells), record.thawed)
+        else:
+            self.cells_cleared(record.cells, record.thawed)
+
+    def first(self) -> Optional[Tuple[int, int]]:
+        """Any connectable pair, or None if the board is stuck - O(1)."""
+        if not self.valid and not self.complete:
+            self.rebuild()
+        return next(iter(self.valid), None)
+
+    def has_moves(self) -> bool:
+        if not self.valid and not self.complete:
+            self.rebuild()
+        return bool(self.valid)
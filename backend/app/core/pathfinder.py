@@ -2,36 +2,229 @@
 Pathfinding algorithm for Pikachu Kawaii game.
 
 Key DSA Concepts:
-1. BFS (Breadth-First Search) - Find shortest path with turn constraints
-2. Queue - For BFS traversal
-3. Set - For visited cell tracking
+1. 0-1 BFS - Fewest-turn path over (cell, direction) states
+2. Deque - 0-cost steps at the front, 1-cost turns at the back
+3. Parent pointers - The path is rebuilt only once the target is reached
 4. 2D Grid traversal with direction vectors
 
-The algorithm finds a path between two matching Pokemon with max 3 turns (4 line segments).
-A "turn" is when the direction changes (horizontal to vertical or vice versa).
+The game rule allows at most 2 turns (3 line segments), possibly through the
+empty ring around the board. A "turn" is when the direction changes
+(horizontal to vertical or vice versa). `find_path_simple` checks the few path
+shapes of that rule; `find_path` is a general 0-1 BFS for any turn limit.
+`find_match` picks between them for the pathfinder's Ruleset (app/core/rules.py).
 """
 
 from collections import deque
-from typing import List, Optional, Tuple
-from ..models.game import Cell, Position, MatchResult, CellType
+from typing import Dict, List, Optional, Tuple, Union
+from ..models.game import Cell, Position, MatchResult
+from .board import CompactBoard, EMPTY, POKEMON
+from .rules import STANDARD, Ruleset
 
 
 class PathFinder:
     """
     Implements BFS-based pathfinding with turn constraints.
 
-    Time Complexity: O(rows * cols * 4) for BFS traversal
-    Space Complexity: O(rows * cols) for queue and visited set
+    Time Complexity: O(rows * cols * 4) for the general search (find_path)
+    Space Complexity: O(rows * cols * 4) for its cost and parent maps
     """
 
     # Direction vectors: right, down, left, up
     DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
     DIRECTION_NAMES = ['RIGHT', 'DOWN', 'LEFT', 'UP']
 
-    def __init__(self, grid: List[List[Cell]], rows: int, cols: int):
-        self.grid = grid
-        self.rows = rows
-        self.cols = cols
+    def __init__(self, grid: Union[CompactBoard, List[List[Cell]]],
+                 rows: Optional[int] = None, cols: Optional[int] = None,
+                 ruleset: Ruleset = STANDARD):
+        if isinstance(grid, CompactBoard):
+            board = grid
+        else:
+            board = CompactBoard.from_grid(grid, rows, cols)
+
+        self.board = board
+        self.rows = board.rows
+        self.cols = board.cols
+        self.kinds = board.kinds
+        self.width = board.width
+        self.ruleset = ruleset
+
+    def _is_empty(self, row: int, col: int) -> bool:
+        """Check a cell of the padded board; the border ring is always empty."""
+        return self.kinds[(row + 1) * self.width + col + 1] == EMPTY
+
+    def _endpoints_valid(self, pos1: Position, pos2: Position) -> bool:
+        """Both cells hold the same unfrozen pokemon and are different cells."""
+        board = self.board
+        idx1 = board.index(pos1.row, pos1.col)
+        idx2 = board.index(pos2.row, pos2.col)
+
+        if board.kinds[idx1] != POKEMON or board.kinds[idx2] != POKEMON:
+            return False
+
+        if board.ids[idx1] != board.ids[idx2]:
+            return False
+
+        if board.frozen[idx1] or board.frozen[idx2]:
+            return False
+
+        return idx1 != idx2
+
+    def connectable(self, idx1: int, idx2: int) -> bool:
+        """Check if two cells (CompactBoard indices) form a valid move."""
+        board = self.board
+        return self.find_match(board.position(idx1), board.position(idx2)).is_valid
+
+    def find_match(self, pos1: Position, pos2: Position) -> MatchResult:
+        """
+        Check a move under the pathfinder's ruleset: the shape checks of
+        find_path_simple for the 2-turn bordered rule, the 0-1 BFS otherwise.
+        """
+        ruleset = self.ruleset
+        if ruleset.standard_paths:
+            return self.find_path_simple(pos1, pos2)
+        return self.find_path(pos1, pos2, ruleset.max_turns, ruleset.border)
+
+    def _all_pairs_search(self) -> List[Tuple[int, int, int]]:
+        """
+        all_pairs for other rulesets: one find_match per same-type pair.
+
+        Time Complexity: O(same-type pairs * rows * cols * 4)
+        """
+        board = self.board
+        pairs = []
+        for cells in board.positions.values():
+            cells = sorted(idx for idx in cells if not board.frozen[idx])
+            for i, a in enumerate(cells):
+                pos_a = board.position(a)
+                for b in cells[i + 1:]:
+                    result = self.find_match(pos_a, board.position(b))
+                    if result.is_valid:
+                        pairs.append((a, b, result.turns))
+        return pairs
+
+    def all_pairs(self) -> List[Tuple[int, int, int]]:
+        """
+        Every valid move on the board in one sweep.
+
+        Returns (idx1, idx2, turns) with idx1 < idx2, where turns is the same
+        turn count find_path_simple reports (the fewest turns of any path).
+
+        Algorithm:
+        1. Label every maximal run of empty cells in each row and each column
+           of the padded board (the border ring is one run per side)
+        2. For each occupied cell, its rays: how far the empty cells extend
+           left/right (a column interval) and up/down (a row interval)
+        3. For each same-type pair, intersect the rays:
+           - 0 turns: the other cell lies within reach on the shared line
+           - 1 turn: a corner cell lies on a ray of each cell
+           - 2 turns: a row (column) both vertical (horizontal) rays reach in
+             which both cells' columns (rows) are in the same empty run
+
+        Time Complexity: O(W * H) for runs and rays, then O(rows + cols)
+                         per same-type pair, with O(1) per candidate line
+        Space Complexity: O(W * H)
+
+        The sweep implements the 2-turn bordered rule; other rulesets fall
+        back to one search per pair.
+        """
+        if not self.ruleset.standard_paths:
+            return self._all_pairs_search()
+
+        board = self.board
+        kinds = board.kinds
+        width = self.width
+        height = self.rows + 2
+        size = width * height
+
+        # 1. Run labels and extents
+        h_run = [-1] * size
+        v_run = [-1] * size
+        run_lo: List[int] = []
+        run_hi: List[int] = []
+
+        for row in range(height):
+            base = row * width
+            for col in range(width):
+                idx = base + col
+                if kinds[idx] != EMPTY:
+                    continue
+                if col > 0 and kinds[idx - 1] == EMPTY:
+                    run = h_run[idx - 1]
+                    run_hi[run] = col
+                else:
+                    run = len(run_lo)
+                    run_lo.append(col)
+                    run_hi.append(col)
+                h_run[idx] = run
+
+        for col in range(width):
+            for row in range(height):
+                idx = row * width + col
+                if kinds[idx] != EMPTY:
+                    continue
+                if row > 0 and kinds[idx - width] == EMPTY:
+                    run = v_run[idx - width]
+                    run_hi[run] = row
+                else:
+                    run = len(run_lo)
+                    run_lo.append(row)
+                    run_hi.append(row)
+                v_run[idx] = run
+
+        # 2. Rays of the selectable cells, grouped by pokemon id
+        rays = {}
+        for pokemon_id, cells in board.positions.items():
+            for idx in cells:
+                if board.frozen[idx]:
+                    continue
+                row, col = divmod(idx, width)
+                left = run_lo[h_run[idx - 1]] if kinds[idx - 1] == EMPTY else col
+                right = run_hi[h_run[idx + 1]] if kinds[idx + 1] == EMPTY else col
+                up = run_lo[v_run[idx - width]] if kinds[idx - width] == EMPTY else row
+                down = run_hi[v_run[idx + width]] if kinds[idx + width] == EMPTY else row
+                rays[idx] = (row, col, left, right, up, down)
+
+        # 3. Intersect rays of same-type pairs
+        pairs = []
+        for cells in board.positions.values():
+            cells = sorted(idx for idx in cells if idx in rays)
+            for i in range(len(cells)):
+                a = cells[i]
+                r1, c1, left1, right1, up1, down1 = rays[a]
+                for j in range(i + 1, len(cells)):
+                    b = cells[j]
+                    r2, c2, left2, right2, up2, down2 = rays[b]
+
+                    if r1 == r2:
+                        if right1 >= c2 - 1:
+                            pairs.append((a, b, 0))
+                            continue
+                    elif c1 == c2:
+                        if down1 >= r2 - 1:
+                            pairs.append((a, b, 0))
+                            continue
+                    elif ((left1 <= c2 <= right1 and up2 <= r1 <= down2) or
+                          (up1 <= r2 <= down1 and left2 <= c1 <= right2)):
+                        pairs.append((a, b, 1))
+                        continue
+
+                    found = False
+                    if c1 != c2:
+                        for row in range(max(up1, up2), min(down1, down2) + 1):
+                            if row != r1 and row != r2 and \
+                                    h_run[row * width + c1] == h_run[row * width + c2]:
+                                found = True
+                                break
+                    if not found and r1 != r2:
+                        for col in range(max(left1, left2), min(right1, right2) + 1):
+                            if col != c1 and col != c2 and \
+                                    v_run[r1 * width + col] == v_run[r2 * width + col]:
+                                found = True
+                                break
+                    if found:
+                        pairs.append((a, b, 2))
+
+        return pairs
 
     def is_valid_position(self, row: int, col: int) -> bool:
         """Check if position is within board boundaries."""
@@ -45,93 +238,120 @@ class PathFinder:
         if not self.is_valid_position(row, col):
             return False
 
-        cell = self.grid[row][col]
-        return (cell.type == CellType.EMPTY or
-                (cell.type == CellType.POKEMON and not cell.is_frozen))
+        idx = self.board.index(row, col)
+        kind = self.kinds[idx]
+        return (kind == EMPTY or
+                (kind == POKEMON and not self.board.frozen[idx]))
 
-    def find_path(self, pos1: Position, pos2: Position) -> MatchResult:
+    def find_path(self, pos1: Position, pos2: Position, max_turns: int = 2,
+                  use_border: bool = True) -> MatchResult:
         """
-        Find a valid path between two positions using BFS with turn constraints.
+        General path search: 0-1 BFS over (cell, direction) states.
 
-        Algorithm:
-        1. Start from pos1
-        2. Explore all 4 directions
-        3. Track turns (direction changes)
-        4. Stop if turns > 3
-        5. Return path if pos2 is reached
+        The reference engine for any turn limit: find_path_simple only knows
+        the path shapes of the 2-turn rule, this search does not rely on them.
 
-        State: (row, col, direction, turns, path)
+        Algorithm:
+        1. States are (padded cell index, direction); cost = turns so far
+        2. Stepping forward into an empty cell costs 0 (pushed to the front),
+           turning 90 degrees in place costs 1 (pushed to the back)
+        3. States leave the deque in order of cost, so the first time the
+           target is stepped into, the turn count is minimal
+        4. Parent pointers per state; the path (turning points only, like
+           find_path_simple) is rebuilt once the target is reached
+
+        With use_border, the path may run through the empty ring around the
+        board (row/col -1 and rows/cols), as in find_path_simple.
+
+        Time Complexity: O(rows * cols * 4) states, each handled once
+        Space Complexity: O(states visited) for the cost and parent maps
         """
-        # Check if positions have matching Pokemon
-        cell1 = self.grid[pos1.row][pos1.col]
-        cell2 = self.grid[pos2.row][pos2.col]
-
-        if cell1.type != CellType.POKEMON or cell2.type != CellType.POKEMON:
+        if not self._endpoints_valid(pos1, pos2):
             return MatchResult(is_valid=False, turns=0)
 
-        if cell1.pokemon_id != cell2.pokemon_id:
-            return MatchResult(is_valid=False, turns=0)
+        board = self.board
+        kinds = self.kinds
+        width = self.width
+        start = board.index(pos1.row, pos1.col)
+        goal = board.index(pos2.row, pos2.col)
 
-        if cell1.is_frozen or cell2.is_frozen:
-            return MatchResult(is_valid=False, turns=0)
+        # Padded rows/cols the path may use
+        low_row, high_row = (0, self.rows + 1) if use_border else (1, self.rows)
+        low_col, high_col = (0, width - 1) if use_border else (1, self.cols)
 
-        # Same position
-        if pos1.row == pos2.row and pos1.col == pos2.col:
-            return MatchResult(is_valid=False, turns=0)
+        # Same order as DIRECTIONS: right, down, left, up
+        steps = (1, width, -1, -width)
+        # Hash maps rather than arrays: a search on a crowded board touches
+        # few states, and must not pay for allocating all of them
+        unvisited = max_turns + 1
+        cost = {}
+        parent = {}
 
-        # BFS with state: (row, col, last_direction, turn_count, path)
-        # last_direction: -1 means no direction yet (start), 0-3 for DIRECTIONS
         queue = deque()
-
-        # Start exploring in all 4 directions
-        for direction_idx in range(4):
-            queue.append((pos1.row, pos1.col, direction_idx, 0, [Position(row=pos1.row, col=pos1.col)]))
-
-        # Visited: (row, col, direction, turns) to avoid revisiting same state
-        visited = set()
-        visited.add((pos1.row, pos1.col, -1, 0))
+        for direction in range(4):
+            state = start * 4 + direction
+            cost[state] = 0
+            parent[state] = -1
+            queue.append(state)
 
         while queue:
-            row, col, last_dir, turns, path = queue.popleft()
-
-            # Explore current direction
-            dr, dc = self.DIRECTIONS[last_dir]
-            new_row, new_col = row + dr, col + dc
-
-            # Check if we can move in this direction
-            if not self.is_valid_position(new_row, new_col):
-                continue
-
-            # Check if reached destination
-            if new_row == pos2.row and new_col == pos2.col:
-                final_path = path + [Position(row=new_row, col=new_col)]
-                return MatchResult(is_valid=True, path=final_path, turns=turns)
-
-            # Check if cell is empty (can pass through)
-            cell = self.grid[new_row][new_col]
-            if cell.type != CellType.EMPTY:
-                continue
-
-            # Add current position to path
-            new_path = path + [Position(row=new_row, col=new_col)]
-
-            # Continue in same direction (no turn)
-            state_same_dir = (new_row, new_col, last_dir, turns)
-            if state_same_dir not in visited:
-                visited.add(state_same_dir)
-                queue.append((new_row, new_col, last_dir, turns, new_path))
-
-            # Try changing direction (add a turn)
-            if turns < 3:  # Max 3 turns allowed
-                for new_dir in range(4):
-                    if new_dir != last_dir:  # Different direction = turn
-                        state_new_dir = (new_row, new_col, new_dir, turns + 1)
-                        if state_new_dir not in visited:
-                            visited.add(state_new_dir)
-                            queue.append((new_row, new_col, new_dir, turns + 1, new_path))
+            state = queue.popleft()
+            idx, direction = divmod(state, 4)
+            turns = cost[state]
+
+            # Step forward (cost 0) if the next cell is inside the search area
+            row, col = divmod(idx, width)
+            if direction == 0:
+                inside = col < high_col
+            elif direction == 1:
+                inside = row < high_row
+            elif direction == 2:
+                inside = col > low_col
+            else:
+                inside = row > low_row
+
+            if inside:
+                nxt = idx + steps[direction]
+                if nxt == goal:
+                    return MatchResult(is_valid=True, turns=turns,
+                                       path=self._unwind(parent, state, goal))
+                next_state = nxt * 4 + direction
+                if kinds[nxt] == EMPTY and turns < cost.get(next_state, unvisited):
+                    cost[next_state] = turns
+                    parent[next_state] = state
+                    queue.appendleft(next_state)
+
+            # Turn 90 degrees in place (cost 1)
+            if turns < max_turns and idx != start:
+                for turned in ((direction + 1) % 4, (direction + 3) % 4):
+                    next_state = idx * 4 + turned
+                    if turns + 1 < cost.get(next_state, unvisited):
+                        cost[next_state] = turns + 1
+                        parent[next_state] = state
+                        queue.append(next_state)
 
         return MatchResult(is_valid=False, turns=0)
 
+    def _unwind(self, parent: Dict[int, int], state: int, goal: int) -> List[Position]:
+        """Turning points from the start to `goal`, following parent pointers."""
+        board = self.board
+        points = [board.position(goal)]
+        direction = state % 4
+
+        while state != -1:
+            idx, state_direction = divmod(state, 4)
+            previous = parent[state]
+            # A turn in place: this cell is a corner of the path
+            if state_direction != direction:
+                points.append(board.position(idx))
+                direction = state_direction
+            if previous == -1:
+                points.append(board.position(idx))
+            state = previous
+
+        points.reverse()
+        return points
+
     def find_path_simple(self, pos1: Position, pos2: Position) -> MatchResult:
         """
         Simplified path finding: checks if two cells can be connected with at most 3 turns.
@@ -142,20 +362,8 @@ class PathFinder:
         3. Two turns (Z or U shape)
         4. Three turns
         """
-        cell1 = self.grid[pos1.row][pos1.col]
-        cell2 = self.grid[pos2.row][pos2.col]
-
         # Validation
-        if cell1.type != CellType.POKEMON or cell2.type != CellType.POKEMON:
-            return MatchResult(is_valid=False, turns=0)
-
-        if cell1.pokemon_id != cell2.pokemon_id:
-            return MatchResult(is_valid=False, turns=0)
-
-        if cell1.is_frozen or cell2.is_frozen:
-            return MatchResult(is_valid=False, turns=0)
-
-        if pos1.row == pos2.row and pos1.col == pos2.col:
+        if not self._endpoints_valid(pos1, pos2):
             return MatchResult(is_valid=False, turns=0)
 
         # Try direct paths (0 turns)
@@ -188,7 +396,7 @@ class PathFinder:
             end_col = max(pos1.col, pos2.col)
 
             for col in range(start_col + 1, end_col):
-                if self.grid[pos1.row][col].type != CellType.EMPTY:
+                if not self._is_empty(pos1.row, col):
                     return MatchResult(is_valid=False, turns=0)
 
             # For straight line, we only need start and end points
@@ -201,7 +409,7 @@ class PathFinder:
             end_row = max(pos1.row, pos2.row)
 
             for row in range(start_row + 1, end_row):
-                if self.grid[row][pos1.col].type != CellType.EMPTY:
+                if not self._is_empty(row, pos1.col):
                     return MatchResult(is_valid=False, turns=0)
 
             # For straight line, we only need start and end points
@@ -236,11 +444,11 @@ class PathFinder:
             # Check if mid1 and mid2 are empty (unless they are the start/end points)
             mid1_valid = (mid1.row == pos1.row and mid1.col == pos1.col) or \
                          (mid1.row == pos2.row and mid1.col == pos2.col) or \
-                         self.grid[mid1.row][mid1.col].type == CellType.EMPTY
+                         self._is_empty(mid1.row, mid1.col)
 
             mid2_valid = (mid2.row == pos1.row and mid2.col == pos1.col) or \
                          (mid2.row == pos2.row and mid2.col == pos2.col) or \
-                         self.grid[mid2.row][mid2.col].type == CellType.EMPTY
+                         self._is_empty(mid2.row, mid2.col)
 
             if (mid1_valid and mid2_valid and
                 self._is_line_clear(pos1, mid1) and
@@ -257,11 +465,11 @@ class PathFinder:
             # Check if mid1 and mid2 are empty (unless they are the start/end points)
             mid1_valid = (mid1.row == pos1.row and mid1.col == pos1.col) or \
                          (mid1.row == pos2.row and mid1.col == pos2.col) or \
-                         self.grid[mid1.row][mid1.col].type == CellType.EMPTY
+                         self._is_empty(mid1.row, mid1.col)
 
             mid2_valid = (mid2.row == pos1.row and mid2.col == pos1.col) or \
                          (mid2.row == pos2.row and mid2.col == pos2.col) or \
-                         self.grid[mid2.row][mid2.col].type == CellType.EMPTY
+                         self._is_empty(mid2.row, mid2.col)
 
             if (mid1_valid and mid2_valid and
                 self._is_line_clear(pos1, mid1) and
@@ -325,13 +533,13 @@ class PathFinder:
             if edge_value == -1:
                 # Top edge: check if all cells from row 0 to pos are clear
                 for row in range(0, pos.row):
-                    if self.grid[row][pos.col].type != CellType.EMPTY:
+                    if not self._is_empty(row, pos.col):
                         return False
                 return True
             else:
                 # Bottom edge: check if all cells from pos to last row are clear
                 for row in range(pos.row + 1, self.rows):
-                    if self.grid[row][pos.col].type != CellType.EMPTY:
+                    if not self._is_empty(row, pos.col):
                         return False
                 return True
         else:
@@ -339,13 +547,13 @@ class PathFinder:
             if edge_value == -1:
                 # Left edge: check if all cells from col 0 to pos are clear
                 for col in range(0, pos.col):
-                    if self.grid[pos.row][col].type != CellType.EMPTY:
+                    if not self._is_empty(pos.row, col):
                         return False
                 return True
             else:
                 # Right edge: check if all cells from pos to last col are clear
                 for col in range(pos.col + 1, self.cols):
-                    if self.grid[pos.row][col].type != CellType.EMPTY:
+                    if not self._is_empty(pos.row, col):
                         return False
                 return True
 
@@ -354,7 +562,7 @@ class PathFinder:
         # Corner must be empty or be one of the endpoints
         if not (corner.row == pos1.row and corner.col == pos1.col) and \
            not (corner.row == pos2.row and corner.col == pos2.col):
-            if self.grid[corner.row][corner.col].type != CellType.EMPTY:
+            if not self._is_empty(corner.row, corner.col):
                 return False
 
         return self._is_line_clear(pos1, corner) and self._is_line_clear(corner, pos2)
@@ -370,7 +578,7 @@ class PathFinder:
             end_col = max(start.col, end.col)
 
             for col in range(start_col + 1, end_col):
-                if self.grid[start.row][col].type != CellType.EMPTY:
+                if not self._is_empty(start.row, col):
                     return False
             return True
 
@@ -380,7 +588,7 @@ class PathFinder:
             end_row = max(start.row, end.row)
 
             for row in range(start_row + 1, end_row):
-                if self.grid[row][start.col].type != CellType.EMPTY:
+                if not self._is_empty(row, start.col):
                     return False
             return True
 
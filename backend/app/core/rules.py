@@ -0,0 +1,169 @@
+"""
+Rule sets for Pikachu Kawaii game.
+
+Key DSA Concepts:
+1. Two-pointer compaction - Gravity slides the tiles of a line in place, O(line)
+2. Incremental updates - Every slide is one clear + one place on the board,
+   so the position index, bitboards and change log stay in sync
+3. Reversible records - Slides are stored in the MoveRecord, so undo / redo
+   put the tiles back without copying the board
+
+A Ruleset covers what differs between levels: how many turns a connecting
+path may take, whether it may run through the empty ring around the board,
+and where tiles slide after a pair is removed. Classic Pikachu levels keep
+the 2-turn rule and change the gravity direction from level to level.
+
+Only one border ring is ever needed: any path that leaves the board further
+out can be pulled back onto the first ring without adding a turn.
+"""
+
+import os
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+from .board import CompactBoard, MoveRecord, EMPTY, POKEMON
+
+
+class Gravity(str, Enum):
+    """Where the remaining tiles slide after a pair is removed."""
+    NONE = "none"
+    DOWN = "down"
+    UP = "up"
+    LEFT = "left"
+    RIGHT = "right"
+    CENTER = "center"  # Both halves of a row slide toward the middle column
+
+
+class Ruleset(NamedTuple):
+    max_turns: int = 2  # Direction changes allowed in a connecting path
+    border: bool = True  # Paths may run through the empty ring around the board
+    gravity: Gravity = Gravity.NONE
+
+    @property
+    def standard_paths(self) -> bool:
+        """The 2-turn bordered rule the shape-based path engines implement."""
+        return self.max_turns == 2 and self.border
+
+    @property
+    def allows_standard_paths(self) -> bool:
+        """Every path valid under the 2-turn bordered rule is valid here too."""
+        return self.max_turns >= 2 and self.border
+
+
+STANDARD = Ruleset()
+
+# Gravity of classic levels 1, 2, 3, ... (the cycle repeats)
+CLASSIC_GRAVITY = [Gravity.NONE, Gravity.DOWN, Gravity.LEFT, Gravity.UP,
+                   Gravity.RIGHT, Gravity.CENTER]
+
+
+def standard_progression(level: int) -> Ruleset:
+    """Same rules on every level: 2 turns, border ring, no gravity."""
+    return STANDARD
+
+
+def classic_progression(level: int) -> Ruleset:
+    """Classic Pikachu: 2 turns and the border ring, gravity changes per level."""
+    return Ruleset(gravity=CLASSIC_GRAVITY[(max(level, 1) - 1) % len(CLASSIC_GRAVITY)])
+
+
+# Level -> Ruleset functions selectable by name (see rules_from_env)
+RULE_PROGRESSIONS: Dict[str, Callable[[int], Ruleset]] = {
+    "standard": standard_progression,
+    "classic": classic_progression,
+}
+
+
+def rules_from_env() -> Callable[[int], Ruleset]:
+    """The progression named by GAME_RULES: "standard" (default) or "classic"."""
+    name = os.getenv("GAME_RULES", "standard")
+    if name not in RULE_PROGRESSIONS:
+        raise ValueError(f"Unknown GAME_RULES: {name}")
+    return RULE_PROGRESSIONS[name]
+
+
+# ----------------------------------------------------------------------
+# Gravity
+# ----------------------------------------------------------------------
+
+def _line(board: CompactBoard, gravity: Gravity, idx: int) -> List[int]:
+    """
+    Cells of the line through `idx` that gravity compacts, the cell tiles
+    slide toward first (for CENTER: only the half of the row holding `idx`).
+    """
+    width = board.width
+    row, col = divmod(idx, width)
+
+    if gravity == Gravity.DOWN:
+        return list(range(board.rows * width + col, col, -width))
+    if gravity == Gravity.UP:
+        return list(range(width + col, (board.rows + 1) * width, width))
+
+    start = row * width
+    if gravity == Gravity.LEFT:
+        return list(range(start + 1, start + board.cols + 1))
+    if gravity == Gravity.RIGHT:
+        return list(range(start + board.cols, start, -1))
+
+    # CENTER: padded columns 1..half slide right, half+1..cols slide left
+    half = board.cols // 2
+    if col <= half:
+        return list(range(start + half, start, -1))
+    return list(range(start + half + 1, start + board.cols + 1))
+
+
+def _compact_line(board: CompactBoard, line: List[int],
+                  slides: List[Tuple[int, int]]) -> None:
+    """
+    Slide the pokemon of one line toward its first cell - O(len(line)).
+
+    Two pointers: `read` walks the line, `write` is the next free cell.
+    Frozen pokemon slide with their ice; other obstacles (ICE cells) stay
+    put and tiles behind them stack up against them.
+    """
+    kinds = board.kinds
+    write = 0
+    for read, idx in enumerate(line):
+        kind = kinds[idx]
+        if kind == EMPTY:
+            continue
+        if kind != POKEMON:
+            write = read + 1
+            continue
+        if read != write:
+            board.move_tile(idx, line[write])
+            slides.append((idx, line[write]))
+        write += 1
+
+
+def apply_gravity(board: CompactBoard, gravity: Gravity,
+                  cleared: Iterable[int]) -> Tuple[Tuple[int, int], ...]:
+    """
+    Compact, in place, the lines that contain the `cleared` cells.
+
+    Returns the slides as (from, to) index pairs in the order they were
+    made. Every tile moves at most once, since each line is compacted once.
+
+    Time Complexity: O(rows + cols) per cleared cell
+    """
+    if gravity == Gravity.NONE:
+        return ()
+
+    slides: List[Tuple[int, int]] = []
+    done = set()
+    for idx in cleared:
+        line = _line(board, gravity, idx)
+        if line[0] not in done:
+            done.add(line[0])
+            _compact_line(board, line, slides)
+    return tuple(slides)
+
+
+def apply_match(board: CompactBoard, a: int, b: int, gravity: Gravity = Gravity.NONE,
+                score_delta: int = 0) -> MoveRecord:
+    """
+    Remove a matched pair (thawing its neighbours), then let gravity act.
+    The returned MoveRecord undoes both.
+    """
+    record = board.remove_pair(a, b, score_delta)
+    slides = apply_gravity(board, gravity, record.cells)
+    return record._replace(slides=slides) if slides else record
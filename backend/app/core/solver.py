@@ -0,0 +1,216 @@
+"""
+Full-board solver for Pikachu Kawaii game.
+
+Key DSA Concepts:
+1. DFS (Depth-First Search) - Explore move sequences with an explicit stack
+2. Zobrist hashing - O(1) incremental 64-bit hash of a board state
+3. Transposition table - Hash map of states already proven to be dead ends
+4. Sleep sets - Skip orderings of independent moves that were already tried
+5. Forced moves - A pair that is the last two tiles of its type is always safe
+
+Why the pruning is sound:
+- Removing a pair only clears cells and thaws ice, so every other valid move
+  stays valid. Two valid moves on different cells are independent: playing
+  them in either order reaches the same state. After exploring move A from a
+  state, a sibling B only has to explore continuations that do not start
+  with A (A goes into B's sleep set while it stays independent).
+- The only real choice is how tiles of one type are paired up. If a valid
+  move removes the last two tiles of its type, taking it can never hurt, so
+  it is the only move explored from that state.
+- A dead-end state explored with sleep set S is skipped when reached again
+  with a sleep set containing S (the earlier search covered at least as much).
+
+Both arguments hold for any turn limit, but not under gravity: sliding tiles
+can block other moves and makes the order of moves matter. With a gravity
+ruleset the search keeps only the transposition table.
+"""
+
+import random
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from ..models.game import MoveRequest, SolveResult
+from .board import CompactBoard, MoveRecord
+from .bitboard import BitboardPathFinder
+from .move_index import MoveIndex
+from .rules import STANDARD, Gravity, Ruleset, apply_match
+
+
+Move = Tuple[int, int]
+
+
+class _Frame:
+    """One level of the DFS stack."""
+
+    __slots__ = ("moves", "next", "sleep", "done", "hash", "undo")
+
+    def __init__(self, moves: List[Move], sleep: FrozenSet[Move], state_hash: int, undo):
+        self.moves = moves
+        self.next = 0
+        self.sleep = sleep
+        self.done: List[Move] = []
+        self.hash = state_hash
+        self.undo = undo  # (MoveRecord, saved index) of the move that led here
+
+
+class Solver:
+    """
+    Decide whether a board can be cleared completely.
+
+    Time Complexity: exponential in the worst case, bounded by
+                     max_nodes / time_limit_ms
+    Space Complexity: O(depth * n) for the stack + transposition table size
+    """
+
+    def __init__(self, board: CompactBoard, pathfinder_class=BitboardPathFinder,
+                 max_nodes: int = 200_000, time_limit_ms: float = 2000.0,
+                 ruleset: Ruleset = STANDARD):
+        # Work on a private copy so the caller's board is never touched
+        self.board = board.copy()
+        self.pathfinder_class = pathfinder_class
+        self.ruleset = ruleset
+        # Sleep sets and forced moves rely on moves being independent
+        self.prune = ruleset.gravity == Gravity.NONE
+        self.max_nodes = max_nodes
+        self.time_limit_ms = time_limit_ms
+        self.nodes = 0
+
+        # Zobrist keys: one per (cell, pokemon id) and one per frozen cell.
+        # Fixed seed so hashes are reproducible between runs.
+        rng = random.Random(0x5EED)
+        size = len(self.board.kinds)
+        self._id_span = max(self.board.ids) + 1
+        self._zobrist_cell = [rng.getrandbits(64) for _ in range(size * self._id_span)]
+        self._zobrist_frozen = [rng.getrandbits(64) for _ in range(size)]
+
+    def _full_hash(self) -> int:
+        board = self.board
+        h = 0
+        for cells in board.positions.values():
+            for idx in cells:
+                h ^= self._zobrist_cell[idx * self._id_span + board.ids[idx]]
+                if board.frozen[idx]:
+                    h ^= self._zobrist_frozen[idx]
+        return h
+
+    # ------------------------------------------------------------------
+    # Move application
+    # ------------------------------------------------------------------
+
+    def _apply(self, index: MoveIndex, move: Move, state_hash: int):
+        """Remove a pair, thaw its neighbours, let gravity act and update index and hash."""
+        board = self.board
+        record = apply_match(board, *move, self.ruleset.gravity)
+
+        zobrist_cell = self._zobrist_cell
+        span = self._id_span
+        for idx, pokemon_id in zip(record.cells, record.ids):
+            state_hash ^= zobrist_cell[idx * span + pokemon_id]
+        for idx in record.thawed:
+            state_hash ^= self._zobrist_frozen[idx]
+        # Every tile slides at most once, so it now sits on its destination
+        for src, dst in record.slides:
+            pokemon_id = board.ids[dst]
+            state_hash ^= zobrist_cell[src * span + pokemon_id] ^ zobrist_cell[dst * span + pokemon_id]
+            if board.frozen[dst]:
+                state_hash ^= self._zobrist_frozen[src] ^ self._zobrist_frozen[dst]
+
+        saved_valid = index.valid
+        index.move_played(record)
+        return state_hash, (record, saved_valid)
+
+    def _revert(self, index: MoveIndex, undo: Tuple[MoveRecord, set]) -> None:
+        """Undo `_apply` from its MoveRecord in O(cells touched)."""
+        record, saved_valid = undo
+        self.board.undo_move(record)
+        index.valid = saved_valid
+
+    def _ordered_moves(self, index: MoveIndex, sleep: FrozenSet[Move]) -> List[Move]:
+        """Valid moves not in the sleep set; a forced move replaces all others."""
+        if not self.prune:
+            return sorted(index.valid)
+
+        positions = self.board.positions
+        moves = []
+        for move in sorted(index.valid):
+            if len(positions[self.board.ids[move[0]]]) == 2:
+                return [] if move in sleep else [move]
+            if move not in sleep:
+                moves.append(move)
+        return moves
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def solve(self) -> SolveResult:
+        """Run the depth-first search within the node and time budget."""
+        started = time.perf_counter()
+        deadline = started + self.time_limit_ms / 1000
+        board = self.board
+
+        def result(solvable: Optional[bool], moves: List[Move] = ()) -> SolveResult:
+            return SolveResult(
+                solvable=solvable,
+                moves=[MoveRequest(pos1=board.position(a), pos2=board.position(b)) for a, b in moves],
+                nodes=self.nodes,
+                elapsed_ms=(time.perf_counter() - started) * 1000
+            )
+
+        if board.remaining == 0:
+            return result(True)
+
+        index = MoveIndex(board, self.pathfinder_class, self.ruleset)
+        failed: Dict[int, FrozenSet[Move]] = {}
+        root_hash = self._full_hash()
+        stack = [_Frame(self._ordered_moves(index, frozenset()), frozenset(), root_hash, None)]
+
+        while stack:
+            frame = stack[-1]
+
+            if frame.next >= len(frame.moves):
+                # Dead end: remember it and backtrack
+                known = failed.get(frame.hash)
+                if known is None or len(frame.sleep) < len(known):
+                    failed[frame.hash] = frame.sleep
+                stack.pop()
+                if frame.undo is not None:
+                    self._revert(index, frame.undo)
+                    stack[-1].done.append(frame.undo[0].cells)
+                continue
+
+            move = frame.moves[frame.next]
+            frame.next += 1
+
+            self.nodes += 1
+            if self.nodes > self.max_nodes or (
+                    self.nodes & 255 == 0 and time.perf_counter() > deadline):
+                return result(None)
+
+            # Moves independent of this one that were already covered
+            a, b = move
+            sleep = frozenset(
+                other for other in (*frame.sleep, *frame.done)
+                if a not in other and b not in other
+            ) if self.prune else frozenset()
+
+            state_hash, undo = self._apply(index, move, frame.hash)
+
+            if board.remaining == 0:
+                return result(True, [f.undo[0].cells for f in stack[1:]] + [move])
+
+            known = failed.get(state_hash)
+            if known is not None and known <= sleep:
+                self._revert(index, undo)
+                frame.done.append(move)
+                continue
+
+            stack.append(_Frame(self._ordered_moves(index, sleep), sleep, state_hash, undo))
+
+        return result(False)
+
+
+def solve_board(board: CompactBoard, pathfinder_class=BitboardPathFinder,
+                max_nodes: int = 200_000, time_limit_ms: float = 2000.0,
+                ruleset: Ruleset = STANDARD) -> SolveResult:
+    """Convenience wrapper: solve a copy of `board` with the given budget."""
+    return Solver(board, pathfinder_class, max_nodes, time_limit_ms, ruleset).solve()
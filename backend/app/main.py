@@ -2,15 +2,36 @@
 Main FastAPI application entry point.
 """
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api.routes import router
+from .api.routes import router, games, work_pool, clock_sweeper, store_maintainer
+from .api.session import router as session_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One background task ends games whose clock ran out
+    sweeper = asyncio.create_task(clock_sweeper(float(os.getenv("CLOCK_SWEEP_SECONDS", "5"))))
+    # Another writes pending games and drops expired ones
+    maintainer = asyncio.create_task(store_maintainer(
+        float(os.getenv("STORE_FLUSH_SECONDS", "1")),
+        float(os.getenv("STORE_EVICT_SECONDS", "60"))))
+    yield
+    sweeper.cancel()
+    maintainer.cancel()
+    # Let running jobs finish, then write pending games to the store
+    work_pool.shutdown()
+    games.close()
 
 
 app = FastAPI(
     title="Pikachu Kawaii API",
     description="Backend API for Pikachu Kawaii game - DSA Project",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for React frontend
@@ -30,6 +51,7 @@ app.add_middleware(
 
 # Include API routes
 app.include_router(router, prefix="/api", tags=["game"])
+app.include_router(session_router, prefix="/api", tags=["session"])
 
 
 @app.get("/")
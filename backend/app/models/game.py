@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
 
 
@@ -46,7 +46,93 @@ class MoveRequest(BaseModel):
     pos2: Position
 
 
+class BatchMoveRequest(BaseModel):
+    moves: List[MoveRequest] = Field(..., min_length=1, max_length=1000)  # Applied in order
+
+
+class ValidMove(BaseModel):
+    pos1: Position
+    pos2: Position
+    turns: int  # Fewest turns of any connecting path
+    points: int  # Score the move would earn
+
+
+class SolveResult(BaseModel):
+    solvable: Optional[bool] = None  # None if the search budget ran out
+    moves: List[MoveRequest] = []  # Winning move sequence when solvable
+    nodes: int = 0  # Search nodes expanded
+    elapsed_ms: float = 0.0
+
+
+class GameDelta(BaseModel):
+    """Changes to a game since `base_version` (compact alternative to GameState)."""
+    version: int  # Board version after the changes
+    base_version: int  # Version the changes apply on top of
+    # Changed cells as [row, col, pokemon_id, is_frozen]; pokemon_id 0 = empty
+    cells: List[Tuple[int, int, int, int]] = []
+    score: int
+    lives: int
+    time_remaining: int
+    score_delta: int = 0  # Changes made by this request
+    lives_delta: int = 0
+    time_delta: int = 0
+    game_over: bool = False
+    victory: bool = False
+
+
+class GameEvent(BaseModel):
+    """One entry of a game's event log (see app/services/event_log.py)."""
+    seq: int
+    kind: str  # create | move | ice | shuffle | undo | redo | clock
+    at: float  # Epoch seconds
+    data: Dict[str, Any] = {}
+
+
 class GameState(BaseModel):
     board: GameBoard
     game_over: bool = False
     victory: bool = False
+    version: int = 0  # Increases with every change to the board
+    # Seed of the game's RNG: generation and every shuffle are reproducible
+    # from it (shuffle n draws from a generator derived from seed and n)
+    seed: Optional[int] = None
+    shuffles: int = 0
+    # Wall-clock time (epoch seconds) up to which board.time_remaining is
+    # accounted for; None while the clock is paused or the game has ended
+    clock_synced_at: Optional[float] = None
+    # Pauses used, and when the current one started (None = not paused);
+    # the server caps both (see GameService.pause_clock)
+    pauses: int = 0
+    paused_at: Optional[float] = None
+
+    # Internal CompactBoard the service works on; `board.grid` is refreshed
+    # from it only when the state is exported at the API edge
+    _compact: Any = PrivateAttr(default=None)
+    # Internal MoveIndex of connectable pairs (None = rebuild on next use)
+    _moves: Any = PrivateAttr(default=None)
+    # Internal EventLog of every change since creation (None = not recorded)
+    _log: Any = PrivateAttr(default=None)
+    # Internal undo / redo stacks of (MoveRecord, saved move index) entries
+    _undo: List[Any] = PrivateAttr(default_factory=list)
+    _redo: List[Any] = PrivateAttr(default_factory=list)
+    # Stored revision this copy was loaded or last saved at (SQLiteGameStore;
+    # None = never stored)
+    _revision: Optional[int] = PrivateAttr(default=None)
+
+
+class CompactGameBoard(GameBoard):
+    """
+    GameBoard with the grid packed into one base64 string: a byte per cell,
+    row-major, holding the pokemon id (0 = empty, 127 = ice block) plus 128
+    if the cell is frozen (see CompactBoard.to_bytes).
+    """
+    grid: str
+
+
+class CompactGameState(GameState):
+    """GameState in the compact wire format (Accept: COMPACT_MEDIA_TYPE)."""
+    board: CompactGameBoard
+
+
+# Media type clients list in Accept to get CompactGameState snapshots
+COMPACT_MEDIA_TYPE = "application/vnd.pokekawaii.compact+json"
@@ -0,0 +1,105 @@
+"""
+Per-game event log for Pikachu Kawaii game.
+
+Key DSA Concepts:
+1. Append-only log - Every change to a game is one small event, O(1) append
+2. Snapshots - Compact copies of the full state every N events
+3. Binary search - Nearest snapshot at or before an event, O(log s)
+4. Replay - Any past state = nearest snapshot + the events after it
+
+Event kinds and their data:
+- "create": seed, level, solvable, rows, cols (the board itself is snapshot 1)
+- "move": pos1, pos2 as [row, col], points
+- "ice": cells thawed by the preceding move, as [[row, col], ...]
+- "shuffle": ensure_move (the shuffle RNG is derived from seed + shuffle count)
+- "undo" / "redo": no data (they pop the game's undo / redo stack)
+- "clock": synced_at after a resume, or None plus time_remaining when the
+  clock stops (game over, victory, or a pause: then also paused_at)
+
+Clock ticks are not logged: they move the anchor and the remaining time
+together, so a replayed game's clock reaches the same deadline.
+
+"ice" events are audit records: replaying the move thaws the same cells.
+
+Snapshot `seq` counts the events it includes: snapshot (n, data) is the
+state after events[0:n]. GameService takes, restores and replays snapshots;
+this module only keeps the log in order.
+"""
+
+import bisect
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Event(NamedTuple):
+    seq: int  # Position in the log, from 0
+    kind: str
+    at: float  # Wall-clock time (epoch seconds)
+    data: Dict[str, Any]
+
+
+class EventLog:
+    """
+    Events of one game plus periodic snapshots.
+
+    Time Complexity:
+    - append: O(1)
+    - nearest_snapshot: O(log snapshots)
+    Space Complexity: O(events + snapshots * cells)
+    """
+
+    def __init__(self, snapshot_every: int = 32):
+        self.snapshot_every = snapshot_every
+        self.events: List[Event] = []
+        self.snapshots: List[Tuple[int, str]] = []  # (seq, serialized state), by seq
+        # Entries already written to durable storage (see SQLiteGameStore)
+        self.saved_events = 0
+        self.saved_snapshots = 0
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def append(self, kind: str, data: Dict[str, Any], at: Optional[float] = None) -> Event:
+        event = Event(len(self.events), kind, time.time() if at is None else at, data)
+        self.events.append(event)
+        return event
+
+    def snapshot_due(self) -> bool:
+        """Check if enough events have accumulated since the last snapshot."""
+        last = self.snapshots[-1][0] if self.snapshots else 0
+        return len(self.events) - last >= self.snapshot_every
+
+    def add_snapshot(self, data: str) -> None:
+        """Store a snapshot of the state after all events logged so far."""
+        self.snapshots.append((len(self.events), data))
+
+    def nearest_snapshot(self, seq: int) -> Optional[Tuple[int, str]]:
+        """Latest snapshot that includes no event after the first `seq`."""
+        i = bisect.bisect_right(self.snapshots, seq, key=lambda snapshot: snapshot[0])
+        return self.snapshots[i - 1] if i else None
+
+    def since(self, seq: int) -> List[Event]:
+        """Events from position `seq` on."""
+        return self.events[max(0, seq):]
+
+    def unsaved(self) -> Tuple[List[Event], List[Tuple[int, str]]]:
+        """Events and snapshots not yet written to durable storage."""
+        return self.events[self.saved_events:], self.snapshots[self.saved_snapshots:]
+
+    def mark_saved(self, events: Optional[int] = None, snapshots: Optional[int] = None) -> None:
+        """
+        Record how many events / snapshots are stored (default: all). Writers
+        pass the counts they saw, since the game may log more in the meantime.
+        """
+        self.saved_events = len(self.events) if events is None else events
+        self.saved_snapshots = len(self.snapshots) if snapshots is None else snapshots
+
+    @classmethod
+    def loaded(cls, events: List[Event], snapshots: List[Tuple[int, str]],
+               snapshot_every: int = 32) -> "EventLog":
+        """Rebuild a log read back from storage (everything counts as saved)."""
+        log = cls(snapshot_every)
+        log.events = list(events)
+        log.snapshots = sorted(snapshots)
+        log.mark_saved()
+        return log
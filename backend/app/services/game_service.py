@@ -3,18 +3,51 @@ Game service managing board state and operations.
 
 Key DSA Concepts:
 1. Fisher-Yates Shuffle - O(n) randomization algorithm
-2. Hash Map - Quick lookup of pokemon positions
+2. Hash Map - Live pokemon id -> positions index kept on the board
 3. Backtracking - Find all valid moves
 4. 2D Matrix operations
+
+All operations run on the array-backed CompactBoard attached to the game
+state. The pydantic grid is only brought up to date by `export`. A MoveIndex
+of connectable pairs is attached as well and updated after every move.
+
+The rules of a game (turn limit, border ring, gravity) come from the Ruleset
+of its level (app/core/rules.py).
+
+Every change is appended to the game's EventLog (app/services/event_log.py).
+Public methods apply a change with an `_apply_*` helper and then record it;
+replay runs the same helpers without recording.
 """
 
+import base64
+import json
+import logging
 import random
-from typing import List, Optional, Tuple, Dict
+import secrets
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple, Union
 from ..models.game import (
-    Cell, CellType, Position, GameBoard,
-    GameState, MatchResult
+    Position, CompactGameState, GameBoard, GameDelta,
+    GameState, MatchResult, SolveResult, ValidMove
 )
-from ..core.pathfinder import PathFinder
+from ..core.board import CompactBoard, MoveRecord
+from ..core.bitboard import PATH_ENGINES, BitboardPathFinder
+from ..core.generator import generate_solvable_board
+from ..core.move_index import MoveIndex
+from ..core.rules import STANDARD, Gravity, Ruleset, apply_match
+from ..core.solver import solve_board
+from .event_log import Event, EventLog
+
+
+logger = logging.getLogger(__name__)
+
+
+class DeltaMark(NamedTuple):
+    """Scalars of a game taken before a request, to report what it changed."""
+    version: int
+    score: int
+    lives: int
+    time_remaining: int
 
 
 class GameService:
@@ -23,24 +56,75 @@ class GameService:
     # Pokemon IDs for different characters (20 different types)
     POKEMON_TYPES = list(range(1, 21))
 
-    def __init__(self, rows: int = 8, cols: int = 12, pokemon_types: int = 20):
+    # Max pair checks when a shuffle looks for a cell pair to plant a move on
+    SHUFFLE_PAIR_BUDGET = 2000
+
+    def __init__(self, rows: int = 8, cols: int = 12, pokemon_types: int = 20,
+                 path_engine: str = "bitboard", debug: bool = False,
+                 generation_budget_ms: float = 50.0, snapshot_every: int = 32,
+                 rules: Union[Ruleset, Callable[[int], Ruleset]] = STANDARD,
+                 max_pauses: int = 3, max_pause_seconds: float = 60.0):
+        if path_engine not in PATH_ENGINES:
+            raise ValueError(f"Unknown path engine: {path_engine}")
+
         self.rows = rows
         self.cols = cols
         self.pokemon_types = pokemon_types
-
-    def create_new_game(self, level: int = 1) -> GameState:
+        # "simple" walks cells, "bitboard" uses row/column masks (same results)
+        self.pathfinder_class = PATH_ENGINES[path_engine]
+        # Re-verify incremental indexes against a full rescan after each mutation
+        self.debug = debug
+        # Latency target for create_new_game; overruns are logged
+        self.generation_budget_ms = generation_budget_ms
+        self.last_generation_ms = 0.0
+        # Events between two snapshots in a game's event log
+        self.snapshot_every = snapshot_every
+        # One Ruleset for every level, or a level -> Ruleset function
+        self.rules = rules
+        # Pauses per game and their length; a longer pause ends by itself, so
+        # pausing cannot buy unlimited time to study the board
+        self.max_pauses = max_pauses
+        self.max_pause_seconds = max_pause_seconds
+
+    def ruleset(self, level: int) -> Ruleset:
+        """The rules of a level."""
+        return self.rules if isinstance(self.rules, Ruleset) else self.rules(level)
+
+    def _rules(self, game_state: GameState) -> Ruleset:
+        return self.ruleset(game_state.board.level)
+
+    def _points(self, turns: int) -> int:
+        """Score of a move: fewer turns = more points, at least 10."""
+        return 10 * max(1, 4 - turns)
+
+    def create_new_game(self, level: int = 1, solvable: bool = False,
+                        seed: Optional[int] = None) -> GameState:
         """
         Create a new game board with randomly distributed Pokemon.
 
+        All randomness comes from a random.Random seeded with `seed` (a fresh
+        random seed if None), stored on the game: the same seed, level and
+        board size always give the same board.
+
         Algorithm:
         1. Calculate how many pairs we need (rows * cols must be even)
         2. Create list of pokemon pairs
         3. Shuffle using Fisher-Yates
         4. Populate grid
 
+        With solvable=True the board is built by reverse construction
+        (see app/core/generator.py) and can always be cleared completely,
+        so it never starts without a valid move. The construction relies on
+        the 2-turn bordered rule without gravity; levels with other rules
+        get a random board.
+
         Time Complexity: O(rows * cols)
         """
+        started = time.perf_counter()
         total_cells = self.rows * self.cols
+        if seed is None:
+            seed = secrets.randbits(32)
+        rng = random.Random(seed)
 
         # Ensure even number of cells
         if total_cells % 2 != 0:
@@ -58,34 +142,31 @@ class GameService:
 
         # If we need more pairs, add random pokemon
         while len(pokemon_list) < total_cells:
-            pokemon_list.append(random.choice(self.POKEMON_TYPES))
+            pokemon_list.append(rng.choice(self.POKEMON_TYPES))
             pokemon_list.append(pokemon_list[-1])  # Add matching pair
 
-        # Fisher-Yates shuffle - O(n)
-        self._shuffle_list(pokemon_list)
-
-        # Create grid without padding
-        grid = []
-        idx = 0
-
-        for row in range(self.rows):
-            grid_row = []
-            for col in range(self.cols):
-                cell = Cell(
-                    type=CellType.POKEMON,
-                    pokemon_id=pokemon_list[idx],
-                    is_frozen=False
-                )
-                idx += 1
-                grid_row.append(cell)
-            grid.append(grid_row)
-
-        # Add ice for higher levels
-        if level > 3:
-            self._add_ice_blocks(grid, level, self.rows, self.cols)
+        rules = self.ruleset(level)
+        if solvable and rules.allows_standard_paths and rules.gravity == Gravity.NONE:
+            # One id per pair, shuffled, then placed by reverse construction
+            pair_ids = pokemon_list[::2][:num_pairs]
+            self._shuffle_list(pair_ids, rng)
+            num_ice = self._ice_count(level, self.rows, self.cols)
+            compact = generate_solvable_board(self.rows, self.cols, pair_ids, num_ice, rng)
+        else:
+            # Fisher-Yates shuffle - O(n)
+            self._shuffle_list(pokemon_list, rng)
+
+            # Populate the compact board (row-major)
+            compact = CompactBoard(self.rows, self.cols)
+            for idx, pokemon_id in zip(compact.cells(), pokemon_list):
+                compact.place(idx, pokemon_id)
+
+            # Add ice for higher levels
+            if level > 3:
+                self._add_ice_blocks(compact, level, rng)
 
         board = GameBoard(
-            grid=grid,
+            grid=compact.to_grid(),
             rows=self.rows,
             cols=self.cols,
             time_remaining=300,  # 5 minutes
@@ -94,9 +175,274 @@ class GameService:
             score=0
         )
 
-        return GameState(board=board, game_over=False, victory=False)
+        game_state = GameState(board=board, game_over=False, victory=False,
+                               seed=seed, clock_synced_at=time.time())
+        game_state._compact = compact
+        self._check_indexes(game_state)
+
+        # The generated board is snapshot 1, so replays never re-run generation
+        log = EventLog(self.snapshot_every)
+        log.append("create", {"seed": seed, "level": level, "solvable": solvable,
+                              "rows": self.rows, "cols": self.cols})
+        log.add_snapshot(self.snapshot(game_state))
+        game_state._log = log
+
+        self.last_generation_ms = (time.perf_counter() - started) * 1000
+        if self.last_generation_ms > self.generation_budget_ms:
+            logger.warning("Board generation for %dx%d took %.1f ms (budget %.1f ms)",
+                           self.rows, self.cols, self.last_generation_ms,
+                           self.generation_budget_ms)
+        return game_state
+
+    def _board(self, game_state: GameState) -> CompactBoard:
+        """Get the compact board of a game, building it from the grid on first use."""
+        compact = game_state._compact
+        if compact is None:
+            board = game_state.board
+            compact = CompactBoard.from_grid(board.grid, board.rows, board.cols)
+            compact.stamp = compact.tracked_from = game_state.version
+            game_state._compact = compact
+        return compact
+
+    def _bump_version(self, game_state: GameState, compact: CompactBoard) -> None:
+        """Start a new board version; cell changes from now on are tagged with it."""
+        game_state.version += 1
+        compact.stamp = game_state.version
+
+    def _move_index(self, game_state: GameState) -> MoveIndex:
+        """Get the valid-move index of a game, building it on first use."""
+        index = game_state._moves
+        if index is None:
+            index = MoveIndex(self._board(game_state), self.pathfinder_class,
+                              self._rules(game_state))
+            game_state._moves = index
+        return index
+
+    def _check_indexes(self, game_state: GameState) -> None:
+        """Debug mode: compare every incremental index with a full rescan."""
+        if not self.debug:
+            return
+
+        compact = self._board(game_state)
+        compact.check_indexes()
+
+        index = game_state._moves
+        if index is not None:
+            fresh = MoveIndex(compact, self.pathfinder_class, self._rules(game_state))
+            if index.complete:
+                assert index.valid == fresh.valid, "move index out of sync with the board"
+            else:
+                assert index.valid <= fresh.valid, "partial move index holds an invalid pair"
+
+    def mark(self, game_state: GameState) -> DeltaMark:
+        """Remember the scalars of a game before a request changes it."""
+        board = game_state.board
+        return DeltaMark(game_state.version, board.score, board.lives, board.time_remaining)
+
+    def delta(self, game_state: GameState, since: Optional[int] = None,
+              mark: Optional[DeltaMark] = None) -> Optional[GameDelta]:
+        """
+        Describe what changed after version `since` (default: since `mark`).
+
+        Only cells whose change stamp is newer than `since` are included.
+        Returns None when that version is too old to be rebuilt from the
+        change log; the client must then fetch a full snapshot.
+
+        Time Complexity: O(cells ever changed), no pydantic grid access
+        """
+        compact = self._board(game_state)
+        board = game_state.board
+        if since is None:
+            since = mark.version if mark is not None else game_state.version
+
+        changed = compact.changes_since(since)
+        if changed is None:
+            return None
+
+        cells = []
+        for idx in changed:
+            row, col = compact.row_col(idx)
+            cells.append((row, col, compact.ids[idx], compact.frozen[idx]))
+
+        return GameDelta(
+            version=game_state.version,
+            base_version=since,
+            cells=cells,
+            score=board.score,
+            lives=board.lives,
+            time_remaining=board.time_remaining,
+            score_delta=board.score - mark.score if mark else 0,
+            lives_delta=board.lives - mark.lives if mark else 0,
+            time_delta=board.time_remaining - mark.time_remaining if mark else 0,
+            game_over=game_state.game_over,
+            victory=game_state.victory
+        )
+
+    def export(self, game_state: GameState) -> GameState:
+        """
+        Bring the pydantic grid up to date before the state leaves the service.
+
+        Time Complexity: O(cells changed since the last export)
+        """
+        if game_state._compact is not None:
+            game_state._compact.flush(game_state.board.grid)
+        return game_state
+
+    def export_compact(self, game_state: GameState) -> CompactGameState:
+        """
+        The state in the compact wire format: the board packed by
+        CompactBoard.to_bytes and base64-encoded instead of one JSON object
+        per cell. The pydantic grid is not touched.
+
+        Time Complexity: O(rows * cols) bytes, no Cell objects
+        """
+        data = game_state.model_dump(exclude={"board": {"grid"}})
+        data["board"]["grid"] = base64.b64encode(self._board(game_state).to_bytes()).decode()
+        return CompactGameState.model_validate(data)
+
+    # ------------------------------------------------------------------
+    # Event log
+    # ------------------------------------------------------------------
 
-    def _shuffle_list(self, items: List[int]) -> None:
+    def _event_log(self, game_state: GameState) -> Optional[EventLog]:
+        """
+        Get the event log of a game. Seeded games without one (stored before
+        logs existed) start a log at their current state; unseeded games are
+        not logged, since their shuffles cannot be replayed.
+        """
+        log = game_state._log
+        if log is None and game_state.seed is not None:
+            log = EventLog(self.snapshot_every)
+            log.add_snapshot(self.snapshot(game_state))
+            game_state._log = log
+        return log
+
+    def _record(self, game_state: GameState, kind: str, data: dict) -> None:
+        """Append an event after a change; snapshot every `snapshot_every` events."""
+        log = self._event_log(game_state)
+        if log is None:
+            return
+        log.append(kind, data)
+        if log.snapshot_due():
+            log.add_snapshot(self.snapshot(game_state))
+
+    def snapshot(self, game_state: GameState) -> str:
+        """
+        Serialize a game compactly: the scalars plus the three board arrays
+        as hex strings, instead of the pydantic grid, and the undo/redo
+        MoveRecords.
+
+        Time Complexity: O(rows * cols + undo depth)
+        """
+        compact = self._board(game_state)
+        return json.dumps({
+            "state": game_state.model_dump(mode="json", exclude={"board": {"grid"}}),
+            "kinds": compact.kinds.hex(),
+            "ids": compact.ids.hex(),
+            "frozen": compact.frozen.hex(),
+            "undo": [record for record, _ in game_state._undo],
+            "redo": [record for record, _ in game_state._redo]
+        }, separators=(",", ":"))
+
+    def restore(self, snapshot: str) -> GameState:
+        """Rebuild a game (without event log) from `snapshot` output."""
+        data = json.loads(snapshot)
+        state = data["state"]
+        board = state["board"]
+        compact = CompactBoard.from_arrays(board["rows"], board["cols"],
+                                           bytes.fromhex(data["kinds"]),
+                                           bytes.fromhex(data["ids"]),
+                                           bytes.fromhex(data["frozen"]))
+        board["grid"] = compact.to_grid()
+
+        game_state = GameState.model_validate(state)
+        compact.stamp = compact.tracked_from = game_state.version
+        game_state._compact = compact
+        for stack in ("undo", "redo"):
+            getattr(game_state, "_" + stack).extend(
+                (MoveRecord(tuple(cells), tuple(ids), tuple(thawed), score_delta,
+                            tuple(map(tuple, slides[0])) if slides else ()), None)
+                for cells, ids, thawed, score_delta, *slides in data.get(stack, ())
+            )
+        return game_state
+
+    def replay(self, log: EventLog, seq: Optional[int] = None) -> GameState:
+        """
+        Rebuild the state after the first `seq` events (default: all).
+        Event 1 creates the game, so there is no state before it: seq >= 1.
+
+        Algorithm:
+        1. Binary search the nearest snapshot at or before `seq`
+        2. Restore it and apply the events after it
+
+        The result has no event log attached. It is exported: its pydantic
+        grid matches the board after the replayed events.
+
+        Time Complexity: O(log snapshots + rows * cols + snapshot_every * move cost)
+        """
+        seq = len(log) if seq is None else seq
+        if not 1 <= seq <= len(log):
+            raise ValueError(f"Event {seq} is outside the log (1..{len(log)})")
+
+        snapshot = log.nearest_snapshot(seq)
+        if snapshot is None:
+            raise ValueError(f"No snapshot at or before event {seq}")
+
+        start, data = snapshot
+        game_state = self.restore(data)
+        for event in log.events[start:seq]:
+            self._apply_event(game_state, event)
+        return self.export(game_state)
+
+    def state_at(self, game_state: GameState, seq: int) -> GameState:
+        """State of a game after its first `seq` events (for audit / undo)."""
+        log = game_state._log
+        if log is None:
+            raise ValueError("Game has no event log")
+        return self.replay(log, seq)
+
+    def resume_log(self, events: List[Event], snapshots: List[Tuple[int, str]]) -> GameState:
+        """Rebuild the current state of a game from a stored log and keep logging."""
+        log = EventLog.loaded(events, snapshots, self.snapshot_every)
+        game_state = self.replay(log)
+        game_state._log = log
+        return game_state
+
+    def _apply_event(self, game_state: GameState, event: Event) -> None:
+        """Apply one logged change without recording it again."""
+        data = event.data
+        if event.kind == "move":
+            pos1, pos2 = data["pos1"], data["pos2"]
+            self._apply_move(game_state, Position(row=pos1[0], col=pos1[1]),
+                             Position(row=pos2[0], col=pos2[1]))
+        elif event.kind == "shuffle":
+            self._apply_shuffle(game_state, data["ensure_move"])
+        elif event.kind == "undo":
+            self._apply_undo(game_state)
+        elif event.kind == "redo":
+            self._apply_redo(game_state)
+        elif event.kind == "clock":
+            game_state.clock_synced_at = data["synced_at"]
+            game_state.paused_at = data.get("paused_at")
+            if "paused_at" in data:
+                game_state.pauses += 1
+            if "time_remaining" in data:
+                game_state.board.time_remaining = data["time_remaining"]
+                game_state.game_over = game_state.game_over or data["time_remaining"] <= 0
+        # "create" and "ice" change nothing: the board is in the first
+        # snapshot and thawing is part of the move
+
+    def _game_rng(self, game_state: GameState, purpose: str, count: int) -> random.Random:
+        """
+        Generator for the `count`-th `purpose` event of a game, derived from
+        the game seed. Only (seed, counter) has to be stored to replay it.
+        Games without a seed (created before seeds existed) get a fresh one.
+        """
+        if game_state.seed is None:
+            return random.Random()
+        return random.Random(f"{game_state.seed}/{purpose}/{count}")
+
+    def _shuffle_list(self, items: List[int], rng=random) -> None:
         """
         Fisher-Yates shuffle algorithm - in-place randomization.
 
@@ -109,21 +455,26 @@ class GameService:
         - Swap items[i] and items[j]
         """
         for i in range(len(items) - 1, 0, -1):
-            j = random.randint(0, i)
+            j = rng.randint(0, i)
             items[i], items[j] = items[j], items[i]
 
-    def _add_ice_blocks(self, grid: List[List[Cell]], level: int, rows: int, cols: int) -> None:
+    def _ice_count(self, level: int, rows: int, cols: int) -> int:
+        """Number of ice blocks for a level (none up to level 3)."""
+        return max(0, min(level - 3, rows * cols // 4))
+
+    def _add_ice_blocks(self, compact: CompactBoard, level: int, rng=random) -> None:
         """Add ice blocks to increase difficulty."""
-        num_ice = min(level - 3, rows * cols // 4)
+        rows, cols = compact.rows, compact.cols
+        num_ice = self._ice_count(level, rows, cols)
 
         ice_positions = set()
         while len(ice_positions) < num_ice:
-            row = random.randint(0, rows - 1)
-            col = random.randint(0, cols - 1)
+            row = rng.randint(0, rows - 1)
+            col = rng.randint(0, cols - 1)
             ice_positions.add((row, col))
 
         for row, col in ice_positions:
-            grid[row][col].is_frozen = True
+            compact.set_frozen(compact.index(row, col), True)
 
     def make_move(self, game_state: GameState, pos1: Position, pos2: Position) -> Tuple[bool, Optional[MatchResult]]:
         """
@@ -131,86 +482,215 @@ class GameService:
 
         Returns: (success, match_result)
         """
+        result, record = self._apply_move(game_state, pos1, pos2)
+        if result is None:
+            return False, None
+
+        compact = self._board(game_state)
+        self._record(game_state, "move", {"pos1": [pos1.row, pos1.col],
+                                          "pos2": [pos2.row, pos2.col],
+                                          "points": record.score_delta})
+        if record.thawed:
+            self._record(game_state, "ice", {"cells": [list(compact.row_col(idx))
+                                                       for idx in record.thawed]})
+        return True, result
+
+    def _apply_move(self, game_state: GameState, pos1: Position,
+                    pos2: Position) -> Tuple[Optional[MatchResult], Optional[MoveRecord]]:
+        """
+        Remove a connectable pair and push its MoveRecord on the undo stack.
+        Returns (match result, record), or (None, None) if the move is invalid.
+        """
         board = game_state.board
-        pathfinder = PathFinder(board.grid, board.rows, board.cols)
+        compact = self._board(game_state)
+
+        if not (compact.is_inside(pos1.row, pos1.col) and
+                compact.is_inside(pos2.row, pos2.col)):
+            return None, None
+
+        rules = self._rules(game_state)
+        pathfinder = self.pathfinder_class(compact, ruleset=rules)
 
         # Find path between positions
-        result = pathfinder.find_path_simple(pos1, pos2)
+        result = pathfinder.find_match(pos1, pos2)
 
         if result.is_valid:
-            # Remove matched pokemon
-            board.grid[pos1.row][pos1.col] = Cell(type=CellType.EMPTY)
-            board.grid[pos2.row][pos2.col] = Cell(type=CellType.EMPTY)
+            self._bump_version(game_state, compact)
+            idx1 = compact.index(pos1.row, pos1.col)
+            idx2 = compact.index(pos2.row, pos2.col)
+            index = game_state._moves
+            saved = self._index_state(index)
+
+            # Remove matched pokemon and adjacent ice, then let the tiles
+            # slide; fewer turns = more points
+            record = apply_match(compact, idx1, idx2, rules.gravity,
+                                 score_delta=self._points(result.turns))
 
-            # Remove adjacent ice
-            self._remove_adjacent_ice(board.grid, pos1)
-            self._remove_adjacent_ice(board.grid, pos2)
+            # Re-validate only the pairs this move can affect
+            if index is not None:
+                index.move_played(record)
 
             # Update score
-            board.score += 10 * (4 - result.turns)  # Fewer turns = more points
+            board.score += record.score_delta
 
             # Check if board is clear
-            if self._is_board_clear(board.grid):
+            if self._is_board_clear(compact):
                 game_state.victory = True
 
-            return True, result
+            game_state._undo.append((record, saved))
+            game_state._redo.clear()
+
+            self._check_indexes(game_state)
+            return result, record
 
-        return False, None
+        return None, None
 
-    def _remove_adjacent_ice(self, grid: List[List[Cell]], pos: Position) -> None:
-        """Remove ice from adjacent cells."""
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        rows = len(grid)
-        cols = len(grid[0]) if grid else 0
+    def _index_state(self, index: Optional[MoveIndex]) -> Optional[tuple]:
+        """
+        The pair set and completeness of a move index, kept next to a
+        MoveRecord so undo/redo restore the index in O(1). Safe to keep by
+        reference: index updates replace the set instead of mutating it.
+        """
+        return (index.valid, index.complete) if index is not None else None
 
-        for dr, dc in directions:
-            new_row, new_col = pos.row + dr, pos.col + dc
+    def undo(self, game_state: GameState) -> bool:
+        """
+        Take back the last move (moves since the last shuffle can be undone).
 
-            if (0 <= new_row < rows and
-                0 <= new_col < cols):
-                grid[new_row][new_col].is_frozen = False
+        Applies the move's MoveRecord backwards: slid tiles moved back, two
+        cells refilled, the thawed ice refrozen, the points taken off.
+        Returns False if there is nothing to undo.
 
-    def _is_board_clear(self, grid: List[List[Cell]]) -> bool:
-        """Check if all pokemon are removed."""
-        for row in grid:
-            for cell in row:
-                if cell.type == CellType.POKEMON:
-                    return False
+        Time Complexity: O(1 + gravity slides), no board copy
+        """
+        if not self._apply_undo(game_state):
+            return False
+        self._record(game_state, "undo", {})
         return True
 
-    def shuffle_board(self, game_state: GameState) -> bool:
+    def redo(self, game_state: GameState) -> bool:
+        """Play the last undone move again - O(1 + slides). False if there is none."""
+        if not self._apply_redo(game_state):
+            return False
+        self._record(game_state, "redo", {})
+        return True
+
+    def _apply_undo(self, game_state: GameState) -> bool:
+        if not game_state._undo:
+            return False
+
+        record, saved = game_state._undo.pop()
+        compact = self._board(game_state)
+        self._bump_version(game_state, compact)
+        compact.undo_move(record)
+        game_state.board.score -= record.score_delta
+        game_state.victory = False
+
+        # Restore the index from before the move, or rebuild it lazily if
+        # that is not known
+        index = game_state._moves
+        game_state._redo.append((record, self._index_state(index)))
+        if index is not None and saved is not None:
+            index.valid, index.complete = saved
+        else:
+            game_state._moves = None
+
+        self._check_indexes(game_state)
+        return True
+
+    def _apply_redo(self, game_state: GameState) -> bool:
+        if not game_state._redo:
+            return False
+
+        record, saved = game_state._redo.pop()
+        compact = self._board(game_state)
+        self._bump_version(game_state, compact)
+        compact.redo_move(record)
+        game_state.board.score += record.score_delta
+        if self._is_board_clear(compact):
+            game_state.victory = True
+
+        index = game_state._moves
+        game_state._undo.append((record, self._index_state(index)))
+        if index is not None:
+            if saved is not None:
+                index.valid, index.complete = saved
+            else:
+                index.move_played(record)
+
+        self._check_indexes(game_state)
+        return True
+
+    def _is_board_clear(self, compact: CompactBoard) -> bool:
+        """Check if all pokemon are removed - O(1) remaining-tile counter."""
+        return compact.remaining == 0
+
+    def shuffle_board(self, game_state: GameState, ensure_move: bool = True) -> bool:
         """
         Shuffle remaining pokemon on board when no valid moves exist.
 
         Algorithm:
-        1. Collect all remaining pokemon
+        1. Collect all remaining pokemon from the position index
         2. Shuffle using Fisher-Yates
-        3. Redistribute to same positions
+        3. If ensure_move: find two unfrozen cells that see each other
+           (the layout of occupied cells does not change) and give them a
+           matching pair, so the new board has at least one valid move
+        4. Redistribute to same positions
 
-        Time Complexity: O(rows * cols)
+        Time Complexity: O(n log n) where n = number of pokemon on board
         """
+        if not self._apply_shuffle(game_state, ensure_move):
+            return False
+        self._record(game_state, "shuffle", {"ensure_move": ensure_move})
+        return True
+
+    def _apply_shuffle(self, game_state: GameState, ensure_move: bool) -> bool:
+        """Shuffle the board (see shuffle_board) without recording it."""
         board = game_state.board
+        compact = self._board(game_state)
 
         # Collect all pokemon and their positions
-        pokemon_list = []
-        positions = []
-
-        for row in range(board.rows):
-            for col in range(board.cols):
-                cell = board.grid[row][col]
-                if cell.type == CellType.POKEMON:
-                    pokemon_list.append(cell.pokemon_id)
-                    positions.append((row, col))
+        positions = compact.pokemon_cells()
+        pokemon_list = [compact.ids[idx] for idx in positions]
 
         if not pokemon_list:
             return False
 
-        # Shuffle pokemon
-        self._shuffle_list(pokemon_list)
+        self._bump_version(game_state, compact)
+        rng = self._game_rng(game_state, "shuffle", game_state.shuffles)
+        game_state.shuffles += 1
 
-        # Redistribute
-        for i, (row, col) in enumerate(positions):
-            board.grid[row][col].pokemon_id = pokemon_list[i]
+        # Shuffle pokemon
+        self._shuffle_list(pokemon_list, rng)
+
+        rules = self._rules(game_state)
+        planted = self._find_open_pair(compact, positions, rng, rules) if ensure_move else None
+        twins = self._first_twins(pokemon_list) if planted is not None else None
+        if twins is not None:
+            # Move the first matching pair of the shuffled list onto the open cells
+            i, j = twins
+            pokemon_id = pokemon_list[i]
+            rest = pokemon_list[:i] + pokemon_list[i + 1:j] + pokemon_list[j + 1:]
+            others = [idx for idx in positions if idx not in planted]
+            assignment = [(planted[0], pokemon_id), (planted[1], pokemon_id)] + list(zip(others, rest))
+        else:
+            planted = None
+            assignment = list(zip(positions, pokemon_list))
+
+        # Redistribute (ice stays where it is)
+        for idx, pokemon_id in assignment:
+            compact.place(idx, pokemon_id, bool(compact.frozen[idx]))
+
+        # Moves from before the shuffle cannot be taken back any more
+        game_state._undo.clear()
+        game_state._redo.clear()
+
+        # Every pair may have changed: keep only the planted pair as a known
+        # move; the full move index is rebuilt lazily once that runs out
+        if planted is not None:
+            game_state._moves = MoveIndex.seeded(compact, self.pathfinder_class, [planted], rules)
+        else:
+            game_state._moves = None
 
         # Reduce lives
         board.lives -= 1
@@ -218,55 +698,225 @@ class GameService:
         if board.lives <= 0:
             game_state.game_over = True
 
+        self._check_indexes(game_state)
         return True
 
+    def _first_twins(self, items: List[int]) -> Optional[Tuple[int, int]]:
+        """Indices of the first two equal items (hash map of first sightings)."""
+        seen = {}
+        for i, item in enumerate(items):
+            if item in seen:
+                return seen[item], i
+            seen[item] = i
+        return None
+
+    def _find_open_pair(self, compact: CompactBoard, positions: List[int],
+                        rng=random, rules: Ruleset = STANDARD) -> Optional[Tuple[int, int]]:
+        """
+        Find two unfrozen occupied cells joined by a valid path shape,
+        whatever pokemon they hold.
+
+        1. Scan the cells from a random start and look along the 4 straight
+           rays of each unfrozen cell for an unfrozen cell - O(1) per cell
+        2. Otherwise test unfrozen pairs for 1-2 turn paths, up to a fixed
+           budget (only if the rules allow every such path)
+
+        Time Complexity: O(n) in the common case
+        """
+        sight = BitboardPathFinder(compact)
+        unfrozen = [idx for idx in positions if not compact.frozen[idx]]
+        if len(unfrozen) < 2:
+            return None
+
+        start = rng.randrange(len(unfrozen))
+        order = unfrozen[start:] + unfrozen[:start]
+
+        for idx in order:
+            for other in sight.in_sight(idx):
+                if not compact.frozen[other]:
+                    return idx, other
+
+        if not rules.allows_standard_paths:
+            return None
+
+        budget = self.SHUFFLE_PAIR_BUDGET
+        for i in range(len(order)):
+            for j in range(i + 1, len(order)):
+                if sight.linked(order[i], order[j]):
+                    return order[i], order[j]
+                budget -= 1
+                if budget <= 0:
+                    return None
+
+        return None
+
+    def all_moves(self, game_state: GameState) -> List[ValidMove]:
+        """
+        Every valid move with its turn count and points, easiest first.
+
+        Uses the pathfinder's all-pairs sweep (shared line-of-sight rays)
+        instead of one path search per pair.
+
+        Time Complexity: O(W * H + same-type pairs * (rows + cols))
+        """
+        compact = self._board(game_state)
+        pairs = self.pathfinder_class(compact, ruleset=self._rules(game_state)).all_pairs()
+        pairs.sort(key=lambda pair: (pair[2], pair[0], pair[1]))
+
+        return [
+            ValidMove(pos1=compact.position(a), pos2=compact.position(b),
+                      turns=turns, points=self._points(turns))
+            for a, b, turns in pairs
+        ]
+
     def find_hint(self, game_state: GameState) -> Optional[Tuple[Position, Position]]:
         """
         Find a valid move as a hint.
 
         Algorithm:
-        1. Group pokemon by type using hash map - O(rows * cols)
-        2. For each pair of same type, check if path exists - O(n^2) worst case
-        3. Return first valid pair found
+        1. Check the game's MoveIndex: O(1) answer when no move exists
+        2. Otherwise pick the indexed pair with the fewest turns (= most
+           points), ties broken by board position; a direct pair ends the
+           scan early
+
+        The index is kept up to date move by move, so no all-pairs sweep is
+        needed. The choice is deterministic, unlike taking any pair from it.
 
-        Time Complexity: O(n^2) where n = number of pokemon on board
+        Time Complexity: O(1) when stuck, else O(indexed pairs * path check)
         """
-        board = game_state.board
+        index = self._move_index(game_state)
+        if not index.has_moves():
+            return None
+
+        compact = self._board(game_state)
+        best, best_key = None, None
+        for a, b in sorted(index.valid):
+            pos1, pos2 = compact.position(a), compact.position(b)
+            turns = index.pathfinder.find_match(pos1, pos2).turns
+            if best_key is None or turns < best_key:
+                best, best_key = (pos1, pos2), turns
+                if turns == 0:
+                    break
+
+        return best
 
-        # Hash map: pokemon_id -> list of positions
-        pokemon_positions: Dict[int, List[Position]] = {}
-
-        for row in range(board.rows):
-            for col in range(board.cols):
-                cell = board.grid[row][col]
-                if cell.type == CellType.POKEMON and not cell.is_frozen:
-                    pos = Position(row=row, col=col)
-                    if cell.pokemon_id not in pokemon_positions:
-                        pokemon_positions[cell.pokemon_id] = []
-                    pokemon_positions[cell.pokemon_id].append(pos)
-
-        # Try to find valid pair
-        pathfinder = PathFinder(board.grid, board.rows, board.cols)
-
-        for pokemon_id, positions in pokemon_positions.items():
-            # Check all pairs of same pokemon type
-            for i in range(len(positions)):
-                for j in range(i + 1, len(positions)):
-                    result = pathfinder.find_path_simple(positions[i], positions[j])
-                    if result.is_valid:
-                        return positions[i], positions[j]
+    def has_valid_moves(self, game_state: GameState) -> bool:
+        """Check if any valid moves exist - O(1) with an up-to-date index."""
+        return self._move_index(game_state).has_moves()
 
-        return None
+    def solve(self, game_state: GameState, max_nodes: int = 200_000,
+              time_limit_ms: float = 2000.0) -> SolveResult:
+        """
+        Check whether the current board can still be cleared completely.
 
-    def has_valid_moves(self, game_state: GameState) -> bool:
-        """Check if any valid moves exist."""
-        return self.find_hint(game_state) is not None
+        Runs the DFS solver (app/core/solver.py) on a copy of the board, so
+        the game itself is not modified. solvable is None if the node or time
+        budget ran out before an answer was found.
+        """
+        return solve_board(self._board(game_state), self.pathfinder_class,
+                           max_nodes=max_nodes, time_limit_ms=time_limit_ms,
+                           ruleset=self._rules(game_state))
 
-    def update_time(self, game_state: GameState, seconds: int) -> None:
-        """Update remaining time."""
+    def _charge_time(self, game_state: GameState, seconds: int) -> None:
         board = game_state.board
         board.time_remaining -= seconds
 
         if board.time_remaining <= 0:
             board.time_remaining = 0
             game_state.game_over = True
+
+    def tick(self, game_state: GameState, now: Optional[float] = None) -> bool:
+        """
+        Charge the time elapsed since the clock was last synced.
+
+        The clock is stored as remaining seconds plus the wall-clock time they
+        were synced at, so nothing has to run while a game is idle: every read
+        or move brings it up to date. Whole seconds are charged and the
+        fraction stays on the clock. Wall-clock time (not monotonic) is used
+        because the anchor is persisted and shared between workers.
+
+        A tick moves the anchor and the remaining seconds together, so the
+        deadline stays put and ticks are not logged: a replayed game keeps an
+        earlier anchor and its next tick charges the same time. Only the
+        clock stopping (game over, victory, pause) or restarting is logged,
+        with the remaining seconds when it stops. A pause longer than
+        max_pause_seconds ends by itself: the clock restarts when it ran out.
+
+        Returns True if the clock stopped or restarted, i.e. the game changed
+        in a way that has to be stored.
+
+        Time Complexity: O(1)
+        """
+        now = time.time() if now is None else now
+        changed = False
+        if game_state.clock_synced_at is None:
+            paused_at = game_state.paused_at
+            if (paused_at is None or game_state.game_over or game_state.victory
+                    or now - paused_at <= self.max_pause_seconds):
+                return False
+            self._start_clock(game_state, paused_at + self.max_pause_seconds)
+            changed = True
+
+        if game_state.game_over or game_state.victory:
+            self._stop_clock(game_state)
+            return True
+
+        synced_at = game_state.clock_synced_at
+        elapsed = int(now - synced_at)
+        if elapsed <= 0:
+            return changed
+
+        game_state.clock_synced_at = synced_at + elapsed
+        self._charge_time(game_state, elapsed)
+        if game_state.game_over:
+            self._stop_clock(game_state)
+            return True
+        return changed
+
+    def _start_clock(self, game_state: GameState, synced_at: float) -> None:
+        game_state.clock_synced_at = synced_at
+        game_state.paused_at = None
+        self._record(game_state, "clock", {"synced_at": synced_at})
+
+    def _stop_clock(self, game_state: GameState, paused_at: Optional[float] = None) -> None:
+        data = {"synced_at": None, "time_remaining": game_state.board.time_remaining}
+        if paused_at is not None:
+            data["paused_at"] = paused_at
+            game_state.pauses += 1
+        game_state.clock_synced_at = None
+        game_state.paused_at = paused_at
+        self._record(game_state, "clock", data)
+
+    def deadline(self, game_state: GameState) -> Optional[float]:
+        """
+        Wall-clock time at which the game runs out of time (None if stopped).
+        A paused game runs out max_pause_seconds after its pause began.
+        """
+        if game_state.game_over or game_state.victory:
+            return None
+        if game_state.clock_synced_at is not None:
+            return game_state.clock_synced_at + game_state.board.time_remaining
+        if game_state.paused_at is not None:
+            return game_state.paused_at + self.max_pause_seconds + game_state.board.time_remaining
+        return None
+
+    def pause_clock(self, game_state: GameState, now: Optional[float] = None) -> bool:
+        """
+        Stop the clock; the remaining time is kept. A game has max_pauses
+        pauses, each of at most max_pause_seconds. Returns False if none are
+        left (pausing a stopped clock changes nothing).
+        """
+        now = time.time() if now is None else now
+        self.tick(game_state, now)
+        if game_state.clock_synced_at is None:
+            return True
+        if game_state.pauses >= self.max_pauses:
+            return False
+        self._stop_clock(game_state, paused_at=now)
+        return True
+
+    def resume_clock(self, game_state: GameState, now: Optional[float] = None) -> None:
+        """Restart a paused clock."""
+        if (game_state.clock_synced_at is None and not game_state.game_over
+                and not game_state.victory):
+            self._start_clock(game_state, time.time() if now is None else now)
@@ -0,0 +1,509 @@
+"""
+Game storage for Pikachu Kawaii game.
+
+Key DSA Concepts:
+1. LRU cache - OrderedDict keeps games in access order, O(1) get/put/evict
+2. TTL eviction - Games idle for longer than the TTL are dropped
+3. Write-behind batching - Changed games are written to SQLite in batches
+4. ULID-style IDs - Timestamp + random bits, unique without coordination
+5. Lock table - One asyncio lock per active game, freed when unused
+6. Event sourcing - Logged games are saved as appended events + snapshots
+7. Optimistic concurrency - Writes are conditional on the stored revision
+
+`MemoryGameStore` keeps games in process memory with bounded size.
+`SQLiteGameStore` puts the same LRU cache in front of a SQLite table, so games
+survive restarts and can be shared by several uvicorn workers on one host.
+Games with an event log are written as their new events (and the occasional
+snapshot) instead of the full state, and loaded by replaying the log.
+
+Every stored game has a revision, bumped by each write. A worker remembers
+the revision of its cached copy: in shared mode (several workers) a cache hit
+is checked against the stored revision and reloaded if another worker wrote
+the game since, and a write made from a stale copy is rejected with
+StaleGameError instead of overwriting the other worker's changes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.game import GameState
+from .event_log import Event
+
+
+logger = logging.getLogger(__name__)
+
+# Crockford base32 (no I, L, O, U), as used by ULIDs
+_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def new_game_id() -> str:
+    """
+    Allocate a game ID: 48-bit millisecond timestamp + 80 random bits.
+
+    IDs from different workers or processes never collide in practice and
+    sort by creation time. No shared counter or lock is needed.
+    """
+    value = (int(time.time() * 1000) << 80) | int.from_bytes(os.urandom(10), "big")
+    chars = []
+    for _ in range(26):
+        value, digit = divmod(value, 32)
+        chars.append(_BASE32[digit])
+    return "game_" + "".join(reversed(chars))
+
+
+class StaleGameError(Exception):
+    """A game was written from a copy older than the stored game."""
+
+    def __init__(self, game_id: str):
+        super().__init__(f"Game {game_id} was changed by another worker")
+        self.game_id = game_id
+
+
+class GameLocks:
+    """
+    One asyncio lock per game, so requests on the same game run one at a
+    time while different games proceed in parallel.
+
+    The locks only cover one process. Across workers, requests on a game are
+    kept apart by the store: a write from a stale copy raises StaleGameError.
+
+    Locks are held in a WeakValueDictionary: a lock disappears as soon as no
+    request holds or waits for it, so the table only grows with active games.
+    """
+
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def __call__(self, game_id: str) -> asyncio.Lock:
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[game_id] = lock
+        return lock
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class GameStore(ABC):
+    """Interface used by the API routes to load and save games."""
+
+    @abstractmethod
+    def get(self, game_id: str) -> Optional[GameState]:
+        """Load a game, or None if it does not exist (or has expired)."""
+
+    @abstractmethod
+    def put(self, game_id: str, game_state: GameState) -> None:
+        """Store a new game or record that a game has changed."""
+
+    @abstractmethod
+    def delete(self, game_id: str) -> bool:
+        """Remove a game. Returns False if it did not exist."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored games."""
+
+    def __contains__(self, game_id: str) -> bool:
+        return self.get(game_id) is not None
+
+    @abstractmethod
+    def cached(self) -> List[Tuple[str, GameState]]:
+        """Games currently held in memory, without touching their LRU order."""
+
+    def flush(self) -> None:
+        """Write pending changes to durable storage (no-op in memory)."""
+
+    @abstractmethod
+    def evict_expired(self) -> int:
+        """Drop games idle for longer than the TTL; returns how many."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+class MemoryGameStore(GameStore):
+    """
+    In-process LRU + TTL store.
+
+    Time Complexity: O(1) amortized per operation
+    Space Complexity: O(max_games)
+    """
+
+    def __init__(self, max_games: int = 10_000, ttl_seconds: float = 3600.0,
+                 on_evict: Optional[Callable[[str, GameState], None]] = None):
+        self.max_games = max_games
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        # game_id -> (game_state, last access time), least recently used first
+        self._games: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, game_id: str) -> Optional[GameState]:
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is None:
+                return None
+
+            game_state, last_access = entry
+            now = time.monotonic()
+            if now - last_access > self.ttl_seconds:
+                self._evict(game_id)
+                return None
+
+            self._games[game_id] = (game_state, now)
+            self._games.move_to_end(game_id)
+            return game_state
+
+    def put(self, game_id: str, game_state: GameState) -> None:
+        with self._lock:
+            self._games[game_id] = (game_state, time.monotonic())
+            self._games.move_to_end(game_id)
+            self.evict_expired()
+            while len(self._games) > self.max_games:
+                self._evict(next(iter(self._games)))
+
+    def delete(self, game_id: str) -> bool:
+        with self._lock:
+            return self._games.pop(game_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def cached(self) -> List[Tuple[str, GameState]]:
+        with self._lock:
+            return [(game_id, entry[0]) for game_id, entry in self._games.items()]
+
+    def evict_expired(self) -> int:
+        """Drop games idle for longer than the TTL (oldest first, stops early)."""
+        evicted = 0
+        with self._lock:
+            cutoff = time.monotonic() - self.ttl_seconds
+            while self._games:
+                game_id, (_, last_access) = next(iter(self._games.items()))
+                if last_access >= cutoff:
+                    break
+                self._evict(game_id)
+                evicted += 1
+        return evicted
+
+    def _evict(self, game_id: str) -> None:
+        game_state, _ = self._games.pop(game_id)
+        if self.on_evict is not None:
+            self.on_evict(game_id, game_state)
+
+
+class SQLiteGameStore(GameStore):
+    """
+    SQLite-backed store with an LRU cache in front and write-behind batching.
+
+    `put` only marks a game dirty. Dirty games are written in one transaction
+    when `batch_size` of them are pending, when `flush_interval` seconds have
+    passed, on eviction from the cache and on `flush`/`close` (the app also
+    flushes on a timer, so an idle server does not hold changes back).
+
+    With `shared=True` (several workers on one database) nothing is held
+    back: `put` writes the game at once, and `get` checks a cached game
+    against the stored revision before serving it.
+
+    Every write is conditional on the revision the cached copy was loaded or
+    last written at (UPDATE ... WHERE revision = ?). A write from a stale
+    copy changes nothing: the copy is dropped from the cache, and `put`
+    raises StaleGameError in shared mode (write-behind only logs it).
+
+    With a `resumer`, games that carry an event log are stored as rows of
+    `game_events` and `game_snapshots`; their `games` row holds the latest
+    snapshot and is only rewritten when a new snapshot was taken. Other games
+    are written as full JSON states.
+    """
+
+    def __init__(self, path: str = "games.db", cache_size: int = 1000,
+                 ttl_seconds: float = 3600.0, batch_size: int = 64,
+                 flush_interval: float = 1.0, shared: bool = False,
+                 exporter: Callable[[GameState], GameState] = lambda state: state,
+                 resumer: Optional[Callable[[List[Event], List[Tuple[int, str]]], GameState]] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.shared = shared
+        # Brings the pydantic grid up to date before serialization
+        self.exporter = exporter
+        # Rebuilds a game from its events and snapshots (None = no event logs)
+        self.resumer = resumer
+
+        self._lock = threading.RLock()
+        self._dirty: Dict[str, GameState] = {}
+        self._last_flush = time.monotonic()
+        self._cache = MemoryGameStore(cache_size, ttl_seconds, on_evict=self._write_back)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None,
+                                     timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            " game_id TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " revision INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(games)")}
+        if "revision" not in columns:
+            self._conn.execute("ALTER TABLE games ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS games_updated_at ON games (updated_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS game_events ("
+            " game_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " at REAL NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (game_id, seq)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS game_snapshots ("
+            " game_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " state TEXT NOT NULL,"
+            " PRIMARY KEY (game_id, seq)) WITHOUT ROWID"
+        )
+
+    def get(self, game_id: str) -> Optional[GameState]:
+        with self._lock:
+            game_state = self._cache.get(game_id)
+            if game_state is not None and (not self.shared or self._is_current(game_id, game_state)):
+                return game_state
+
+            row = self._conn.execute(
+                "SELECT state, updated_at, revision FROM games WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > self.ttl_seconds:
+                self._forget(game_id)
+                return None
+
+            game_state = self._load_logged(game_id)
+            if game_state is None:
+                game_state = GameState.model_validate_json(row[0])
+            game_state._revision = row[2]
+            self._cache.put(game_id, game_state)
+            return game_state
+
+    def _is_current(self, game_id: str, game_state: GameState) -> bool:
+        """Check that no other worker wrote the game since this copy was stored - O(1)."""
+        if game_id in self._dirty:
+            return True
+        row = self._conn.execute(
+            "SELECT revision FROM games WHERE game_id = ?", (game_id,)
+        ).fetchone()
+        return row is not None and row[0] == game_state._revision
+
+    def _forget(self, game_id: str) -> None:
+        """Drop a game from the cache without writing it back."""
+        self._dirty.pop(game_id, None)
+        self._cache.delete(game_id)
+
+    def _load_logged(self, game_id: str) -> Optional[GameState]:
+        """Replay a game stored as events + snapshots (None if it is not)."""
+        if self.resumer is None:
+            return None
+
+        snapshots = self._conn.execute(
+            "SELECT seq, state FROM game_snapshots WHERE game_id = ? ORDER BY seq", (game_id,)
+        ).fetchall()
+        if not snapshots:
+            return None
+
+        events = [
+            Event(seq, kind, at, json.loads(data))
+            for seq, kind, at, data in self._conn.execute(
+                "SELECT seq, kind, at, data FROM game_events WHERE game_id = ? ORDER BY seq",
+                (game_id,))
+        ]
+        return self.resumer(events, snapshots)
+
+    def put(self, game_id: str, game_state: GameState) -> None:
+        with self._lock:
+            self._cache.put(game_id, game_state)
+            self._dirty[game_id] = game_state
+            if (self.shared or len(self._dirty) >= self.batch_size or
+                    time.monotonic() - self._last_flush >= self.flush_interval):
+                stale = self.flush()
+                if game_id in stale and self.shared:
+                    raise StaleGameError(game_id)
+
+    def delete(self, game_id: str) -> bool:
+        with self._lock:
+            cached = self._cache.delete(game_id)
+            self._dirty.pop(game_id, None)
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM game_events WHERE game_id = ?", (game_id,))
+            self._conn.execute("DELETE FROM game_snapshots WHERE game_id = ?", (game_id,))
+            deleted = self._conn.execute(
+                "DELETE FROM games WHERE game_id = ?", (game_id,)
+            ).rowcount
+            self._conn.execute("COMMIT")
+            return cached or deleted > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def cached(self) -> List[Tuple[str, GameState]]:
+        return self._cache.cached()
+
+    def flush(self) -> List[str]:
+        """
+        Write all dirty games in a single transaction: new events and
+        snapshots of logged games, full states of the others.
+
+        Each game is written in its own savepoint, only if its stored
+        revision is still the one its copy came from. Returns the IDs of the
+        games whose copy was stale; they are dropped from the cache.
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._dirty:
+                return []
+
+            dirty, self._dirty = self._dirty, {}
+            now = time.time()
+            stale, saved = [], []
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for game_id, state in dirty.items():
+                    self._conn.execute("SAVEPOINT game")
+                    try:
+                        written = self._write(game_id, state, now)
+                    except sqlite3.IntegrityError:
+                        written = None  # Another worker added the same event or game
+                    if written is None:
+                        self._conn.execute("ROLLBACK TO game")
+                        stale.append(game_id)
+                    else:
+                        saved.append((state, written))
+                    self._conn.execute("RELEASE game")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                # Keep the games dirty for the next flush (newer puts win)
+                self._dirty = {**dirty, **self._dirty}
+                raise
+
+            for state, (revision, log, events, snapshots) in saved:
+                state._revision = revision
+                if log is not None:
+                    log.mark_saved(events, snapshots)
+            for game_id in stale:
+                logger.warning("Dropped a stale write of %s (changed by another worker)", game_id)
+                self._forget(game_id)
+            return stale
+
+    def _write(self, game_id: str, state: GameState, now: float) -> Optional[tuple]:
+        """
+        Write one game if its stored revision is unchanged. Returns the new
+        revision plus the log counts to mark saved, or None if stale.
+        """
+        log = state._log if self.resumer is not None else None
+        events, snapshots = log.unsaved() if log is not None else ([], [])
+        if log is None:
+            payload = self.exporter(state).model_dump_json()
+        else:
+            payload = snapshots[-1][1] if snapshots else None
+
+        revision = state._revision
+        if revision is None:
+            # New game: the first write creates the row (IDs never repeat)
+            self._conn.execute(
+                "INSERT INTO games (game_id, state, updated_at, revision) VALUES (?, ?, ?, 1)",
+                (game_id, payload if payload is not None else self.exporter(state).model_dump_json(),
+                 now)
+            )
+        elif self._conn.execute(
+                "UPDATE games SET state = COALESCE(?, state), updated_at = ?, "
+                "revision = revision + 1 WHERE game_id = ? AND revision = ?",
+                (payload, now, game_id, revision)).rowcount == 0:
+            return None
+
+        self._conn.executemany(
+            "INSERT INTO game_events (game_id, seq, kind, at, data) VALUES (?, ?, ?, ?, ?)",
+            [(game_id, event.seq, event.kind, event.at, json.dumps(event.data)) for event in events]
+        )
+        self._conn.executemany(
+            "INSERT INTO game_snapshots (game_id, seq, state) VALUES (?, ?, ?)",
+            [(game_id, seq, data) for seq, data in snapshots]
+        )
+        new_revision = 1 if revision is None else revision + 1
+        if log is None:
+            return new_revision, None, 0, 0
+        return (new_revision, log, log.saved_events + len(events),
+                log.saved_snapshots + len(snapshots))
+
+    def evict_expired(self) -> int:
+        """Drop idle games from the cache and delete expired rows."""
+        with self._lock:
+            self._cache.evict_expired()
+            self.flush()
+
+            cutoff = time.time() - self.ttl_seconds
+            self._conn.execute("BEGIN IMMEDIATE")
+            for table in ("game_events", "game_snapshots"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE game_id IN "
+                    "(SELECT game_id FROM games WHERE updated_at < ?)", (cutoff,)
+                )
+            deleted = self._conn.execute(
+                "DELETE FROM games WHERE updated_at < ?", (cutoff,)
+            ).rowcount
+            self._conn.execute("COMMIT")
+            return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def _write_back(self, game_id: str, game_state: GameState) -> None:
+        """Cache eviction: make sure a dirty game reaches the database."""
+        if game_id in self._dirty:
+            self.flush()
+
+
+def create_game_store(exporter: Callable[[GameState], GameState] = lambda state: state,
+                      resumer: Optional[Callable[[List[Event], List[Tuple[int, str]]], GameState]] = None
+                      ) -> GameStore:
+    """
+    Build the store selected by environment variables (`exporter` and
+    `resumer` are passed to SQLiteGameStore):
+
+    - GAME_STORE: "memory" (default) or "sqlite"
+    - GAME_DB_PATH: SQLite file (default games.db)
+    - GAME_CACHE_SIZE: Max games kept in memory (default 10000)
+    - GAME_TTL_SECONDS: Idle time before a game is evicted (default 3600)
+    - GAME_STORE_SHARED: "1" when several workers use the SQLite file (write
+      through, revalidate cached games); defaults to "1" if uvicorn's
+      WEB_CONCURRENCY asks for more than one worker
+    """
+    kind = os.getenv("GAME_STORE", "memory")
+    cache_size = int(os.getenv("GAME_CACHE_SIZE", "10000"))
+    ttl_seconds = float(os.getenv("GAME_TTL_SECONDS", "3600"))
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    shared = os.getenv("GAME_STORE_SHARED", "1" if workers > 1 else "0") == "1"
+
+    if kind == "sqlite":
+        return SQLiteGameStore(os.getenv("GAME_DB_PATH", "games.db"), cache_size=cache_size,
+                               ttl_seconds=ttl_seconds, shared=shared,
+                               exporter=exporter, resumer=resumer)
+    if kind == "memory":
+        return MemoryGameStore(max_games=cache_size, ttl_seconds=ttl_seconds)
+
+    raise ValueError(f"Unknown GAME_STORE: {kind}")
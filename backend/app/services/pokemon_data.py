@@ -3,8 +3,17 @@ Pokemon data configuration for the game.
 
 Using PokeAPI sprite URLs for Pokemon images.
 Source: https://github.com/PokeAPI/sprites
+
+The data never changes while the server runs, so the catalogue is built once
+at import: an id -> entry hash map for lookups, and the `/api/pokemon` body
+already serialized, gzipped and tagged (see CATALOGUE_RESPONSE).
 """
 
+import gzip
+import hashlib
+import json
+from typing import Dict, List, NamedTuple
+
 # 20 popular Pokemon with their PokeAPI IDs
 POKEMON_LIST = [
     {"id": 1, "name": "Pikachu", "pokedex_id": 25},
@@ -30,6 +39,28 @@ POKEMON_LIST = [
 ]
 
 
+SPRITE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{}.png"
+
+# Game id -> entry - O(1) lookups
+POKEMON_BY_ID: Dict[int, dict] = {p["id"]: p for p in POKEMON_LIST}
+
+
+class EncodedBody(NamedTuple):
+    """A response body serialized once, plain and gzipped, with an ETag for each."""
+    body: bytes
+    gzipped: bytes
+    etag: str
+    gzip_etag: str
+
+    @classmethod
+    def from_json(cls, data) -> "EncodedBody":
+        body = json.dumps(data, separators=(",", ":")).encode()
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        # mtime=0 keeps the compressed bytes identical between restarts
+        return cls(body, gzip.compress(body, compresslevel=9, mtime=0),
+                   f'"{digest}"', f'"{digest}-gz"')
+
+
 def get_pokemon_sprite_url(pokemon_id: int) -> str:
     """
     Get the sprite URL for a Pokemon from PokeAPI.
@@ -40,30 +71,35 @@ def get_pokemon_sprite_url(pokemon_id: int) -> str:
     Returns:
         URL to Pokemon sprite image
     """
-    pokemon = next((p for p in POKEMON_LIST if p["id"] == pokemon_id), None)
+    pokemon = POKEMON_BY_ID.get(pokemon_id)
     if not pokemon:
         return ""
 
-    pokedex_id = pokemon["pokedex_id"]
-
     # PokeAPI sprites CDN
-    return f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokedex_id}.png"
+    return SPRITE_URL.format(pokemon["pokedex_id"])
 
 
 def get_pokemon_name(pokemon_id: int) -> str:
     """Get the name of a Pokemon by game ID."""
-    pokemon = next((p for p in POKEMON_LIST if p["id"] == pokemon_id), None)
+    pokemon = POKEMON_BY_ID.get(pokemon_id)
     return pokemon["name"] if pokemon else f"Pokemon {pokemon_id}"
 
 
-def get_all_pokemon_data():
-    """Get all Pokemon data with sprite URLs."""
-    return [
-        {
-            "id": p["id"],
-            "name": p["name"],
-            "pokedex_id": p["pokedex_id"],
-            "sprite_url": get_pokemon_sprite_url(p["id"])
-        }
-        for p in POKEMON_LIST
-    ]
+# Entries with sprite URLs, in game id order
+CATALOGUE = tuple(
+    {
+        "id": p["id"],
+        "name": p["name"],
+        "pokedex_id": p["pokedex_id"],
+        "sprite_url": SPRITE_URL.format(p["pokedex_id"])
+    }
+    for p in POKEMON_LIST
+)
+
+# The complete `/api/pokemon` response body
+CATALOGUE_RESPONSE = EncodedBody.from_json({"pokemon": CATALOGUE})
+
+
+def get_all_pokemon_data() -> List[dict]:
+    """Get all Pokemon data with sprite URLs (copies of the built catalogue)."""
+    return [dict(entry) for entry in CATALOGUE]
@@ -0,0 +1,73 @@
+"""
+Sprite atlas for Pikachu Kawaii game.
+
+All pokemon sprites packed into one PNG plus a JSON map of each sprite's
+rectangle, served by the API so a client loads every sprite with a single
+request and needs no remote CDN. Both files are built by
+build_sprite_atlas.py, which the Dockerfile and build.sh run at build time.
+
+The image URL carries a hash of its content (atlas.<hash>.png), so it can
+be cached forever: a rebuilt atlas gets a new URL. The file is memory-mapped
+once and streamed from the mapping; requests never read it into the heap.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+from typing import Iterator, Optional
+
+from .pokemon_data import EncodedBody
+
+
+logger = logging.getLogger(__name__)
+
+ATLAS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "static", "sprites")
+IMAGE_NAME = "atlas.png"
+MANIFEST_NAME = "atlas.json"
+
+# Bytes per chunk when streaming the mapped image
+CHUNK_SIZE = 64 * 1024
+
+
+class SpriteAtlas:
+    """A built atlas: the mapped image, its hashed name and the encoded map."""
+
+    def __init__(self, image_path: str, manifest: dict):
+        with open(image_path, "rb") as f:
+            # The mapping stays valid after the file is closed
+            self.image = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        digest = hashlib.sha256(self.image).hexdigest()[:16]
+        self.image_name = f"atlas.{digest}.png"
+        self.etag = f'"{digest}"'
+        # `image` is relative to the manifest URL
+        self.manifest = EncodedBody.from_json({**manifest, "image": self.image_name})
+
+    def __len__(self) -> int:
+        return len(self.image)
+
+    def chunks(self) -> Iterator[bytes]:
+        """The image in CHUNK_SIZE slices of the mapping."""
+        for start in range(0, len(self.image), CHUNK_SIZE):
+            yield self.image[start:start + CHUNK_SIZE]
+
+
+def load_atlas(directory: str = ATLAS_DIR) -> Optional[SpriteAtlas]:
+    """The atlas in `directory`, or None if it was not built."""
+    image_path = os.path.join(directory, IMAGE_NAME)
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if not (os.path.isfile(image_path) and os.path.isfile(manifest_path)):
+        logger.warning("No sprite atlas in %s: clients will fetch every sprite from the CDN "
+                       "(run build_sprite_atlas.py)", directory)
+        return None
+
+    if os.path.getsize(image_path) == 0:
+        logger.warning("Empty sprite atlas image: %s", image_path)
+        return None
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return SpriteAtlas(image_path, manifest)
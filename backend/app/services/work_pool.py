@@ -0,0 +1,170 @@
+"""
+Execution layer for CPU-heavy game operations.
+
+Key DSA Concepts:
+1. Bounded queue - At most `max_workers + max_queue` jobs are admitted;
+   further jobs are rejected at once instead of queueing without limit
+2. Backpressure - Rejections surface as PoolSaturated (HTTP 503 in the API)
+3. Sliding window - The last samples of queue wait / run time give p50/p99
+
+Cheap operations run inline on the event loop. Heavy ones (hint search,
+solvability checks, work on large boards) run on a thread pool, so a slow
+request on one game no longer stalls every other request on the worker.
+
+A thread pool is used rather than a process pool: the jobs work on live
+GameState objects (compact board, move index) that are shared mutable
+state, which would have to be copied across a process boundary both ways.
+Pure-Python work still holds the GIL, but the interpreter switches threads
+every few milliseconds, so the event loop keeps serving cheap requests.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class PoolSaturated(Exception):
+    """Raised when the pool's queue is full."""
+
+
+class WorkPool:
+    """
+    Thread pool with admission control and latency metrics.
+
+    Time Complexity: O(1) per submission; O(w log w) for metrics,
+                     w = sample window
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 64,
+                 inline_cells: int = 200, window: int = 1024):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        # Boards with at least this many cells count as heavy
+        self.inline_cells = inline_cells
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="game-work")
+
+        # Admitted jobs not finished yet (queued + running); event loop only
+        self.pending = 0
+        # Counters touched from worker threads
+        self._lock = threading.Lock()
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.inline = 0
+        self._wait_ms = deque(maxlen=window)
+        self._run_ms = deque(maxlen=window)
+
+    def is_heavy(self, cells: int) -> bool:
+        """Check if work on a board of `cells` cells should leave the event loop."""
+        return cells >= self.inline_cells
+
+    async def run(self, fn: Callable[..., T], *args, offload: bool = True, **kwargs) -> T:
+        """
+        Run `fn(*args, **kwargs)` and return its result.
+
+        With offload=False the call runs inline. Otherwise it is queued on the
+        pool; PoolSaturated is raised if the queue is full. If the awaiting
+        request is cancelled, this still waits for the job to finish, so
+        per-game locks held by the caller cover the whole mutation.
+        """
+        if not offload:
+            self.inline += 1
+            return fn(*args, **kwargs)
+
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PoolSaturated(f"{self.pending} jobs pending")
+
+        self.pending += 1
+        self.submitted += 1
+        queued_at = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self.running += 1
+                self._wait_ms.append((started - queued_at) * 1000)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self._run_ms.append((time.perf_counter() - started) * 1000)
+
+        future = asyncio.get_running_loop().run_in_executor(self._executor, job)
+        try:
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait({future})
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        return result
+
+    @staticmethod
+    def _percentiles(samples) -> dict:
+        if not samples:
+            return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        count = len(ordered)
+        # Nearest-rank percentiles
+        return {
+            "p50": round(ordered[-(-count * 50 // 100) - 1], 3),
+            "p99": round(ordered[-(-count * 99 // 100) - 1], 3),
+            "max": round(ordered[-1], 3)
+        }
+
+    def metrics(self) -> dict:
+        """Queue depth, counters and recent latency percentiles."""
+        with self._lock:
+            running = self.running
+            wait_ms = list(self._wait_ms)
+            run_ms = list(self._run_ms)
+
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": max(self.pending - running, 0),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "inline": self.inline,
+            "queue_wait_ms": self._percentiles(wait_ms),
+            "run_ms": self._percentiles(run_ms)
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def create_work_pool(max_workers: Optional[int] = None) -> WorkPool:
+    """
+    Build the pool from environment variables:
+
+    - WORK_POOL_THREADS: Worker threads (default min(4, CPU count))
+    - WORK_POOL_QUEUE: Jobs allowed to wait for a thread (default 64)
+    - WORK_POOL_INLINE_CELLS: Boards smaller than this run inline (default 200)
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("WORK_POOL_THREADS", str(min(4, os.cpu_count() or 1))))
+    return WorkPool(
+        max_workers=max_workers,
+        max_queue=int(os.getenv("WORK_POOL_QUEUE", "64")),
+        inline_cells=int(os.getenv("WORK_POOL_INLINE_CELLS", "200"))
+    )
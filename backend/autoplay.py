@@ -0,0 +1,45 @@
+"""
+Auto-play tool for Pikachu Kawaii game.
+
+Generates a game, asks the solver for a move sequence that clears the board
+and replays it through GameService.make_move.
+
+Run: python autoplay.py [rows] [cols] [level]
+"""
+
+import sys
+
+from app.services.game_service import GameService
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    level = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    service = GameService(rows=rows, cols=cols)
+    game_state = service.create_new_game(level=level)
+
+    print(f"Board {rows}x{cols}, level {level}")
+    solution = service.solve(game_state)
+    print(f"Solver: solvable={solution.solvable}, nodes={solution.nodes}, "
+          f"time={solution.elapsed_ms:.1f} ms")
+
+    if not solution.solvable:
+        print("❌ No solution to replay")
+        return
+
+    for step, move in enumerate(solution.moves, 1):
+        success, result = service.make_move(game_state, move.pos1, move.pos2)
+        if not success:
+            print(f"❌ Move {step} rejected: {move}")
+            return
+        print(f"  {step:3}. ({move.pos1.row},{move.pos1.col}) -> "
+              f"({move.pos2.row},{move.pos2.col})  turns={result.turns}  "
+              f"score={game_state.board.score}")
+
+    print(f"✅ Board cleared: victory={game_state.victory}, score={game_state.board.score}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Micro-benchmarks of the game's hot paths for Pikachu Kawaii game.
+
+Measures find_path (BFS), find_path_simple, find_hint and shuffle_board on
+fixed-seed boards from 8x12 up to 64x64, at several emptiness levels and ice
+densities. Every operation is timed on its own with time.perf_counter; the
+report gives ops/sec and p50/p95/p99 latencies.
+
+Results are written as JSON and compared with a stored baseline
+(benchmarks/baseline_<engine>.json): a benchmark whose median latency is more than
+`tolerance` above the baseline is a regression and the run exits with 1.
+The suite runs `--repeat` times and each benchmark's lowest median counts,
+so one noisy stretch does not fail the gate.
+Baselines are machine specific; regenerate yours with --update-baseline
+before changing a path engine.
+
+Run from backend/:
+    python -m benchmarks.hot_paths                    # full suite vs baseline
+    python -m benchmarks.hot_paths --quick            # small boards only
+    python -m benchmarks.hot_paths --engine simple    # other path engine
+    python -m benchmarks.hot_paths --update-baseline  # store a new baseline
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.bitboard import PATH_ENGINES
+from app.core.board import CompactBoard
+from app.models.game import GameBoard, GameState, Position
+from app.services.game_service import GameService
+
+
+# Stored baselines, one per path engine: baseline_<engine>.json
+BASELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BOARD_SIZES = [(8, 12), (16, 24), (32, 48), (64, 64)]
+QUICK_SIZES = [(8, 12), (16, 24)]
+EMPTINESS = [0.0, 0.5, 0.8]  # Fraction of pairs already removed
+ICE_DENSITY = [0.0, 0.1]  # Fraction of remaining tiles frozen
+POKEMON_TYPES = 20
+
+# Path queries per board: same-type pairs, connectable or not
+PATH_QUERIES = 64
+
+
+class Case(NamedTuple):
+    rows: int
+    cols: int
+    emptiness: float
+    ice: float
+
+    @property
+    def name(self) -> str:
+        return f"{self.rows}x{self.cols}/empty{int(self.emptiness * 100)}/ice{int(self.ice * 100)}"
+
+
+def build_game(case: Case) -> GameState:
+    """
+    Deterministic board for a case: full pairs, shuffled, then a fraction of
+    the pairs removed and a fraction of the remaining tiles frozen.
+    """
+    rng = random.Random(f"bench/{case.name}")
+    board = CompactBoard(case.rows, case.cols)
+    cells = list(board.cells())
+    rng.shuffle(cells)
+
+    pairs = [(cells[i], cells[i + 1]) for i in range(0, len(cells) - 1, 2)]
+    kept = pairs[int(len(pairs) * case.emptiness):]
+    for a, b in kept:
+        pokemon_id = rng.randint(1, POKEMON_TYPES)
+        board.place(a, pokemon_id)
+        board.place(b, pokemon_id)
+
+    occupied = [idx for pair in kept for idx in pair]
+    for idx in rng.sample(occupied, int(len(occupied) * case.ice)):
+        board.set_frozen(idx, True)
+
+    game_state = GameState(
+        board=GameBoard(grid=board.to_grid(), rows=case.rows, cols=case.cols,
+                        time_remaining=300, lives=5, level=1, score=0),
+        seed=rng.getrandbits(32)
+    )
+    game_state._compact = board
+    return game_state
+
+
+def path_queries(board: CompactBoard, count: int, rng: random.Random) -> List[Tuple[Position, Position]]:
+    """Random same-type unfrozen pairs (the queries players actually make)."""
+    groups = [sorted(idx for idx in cells if not board.frozen[idx])
+              for cells in board.positions.values()]
+    groups = [cells for cells in groups if len(cells) >= 2]
+    queries = []
+    for _ in range(count if groups else 0):
+        a, b = rng.sample(rng.choice(groups), 2)
+        queries.append((board.position(a), board.position(b)))
+    return queries
+
+
+def measure(op: Callable[..., object], min_time: float, min_ops: int,
+            max_ops: int, warmup: int = 1,
+            setup: Optional[Callable[[], object]] = None, cycle: int = 1) -> List[float]:
+    """
+    Time single calls of `op` (seconds) until both minimums are reached.
+    With `setup`, each call gets a fresh setup() result, built untimed.
+    An `op` that cycles through `cycle` inputs is stopped after whole cycles
+    only, so every input weighs the same in the percentiles.
+    The garbage collector is off while timing (as in timeit), so a
+    collection set off by setup garbage is not charged to `op`.
+    """
+    def call() -> float:
+        args = () if setup is None else (setup(),)
+        t0 = time.perf_counter()
+        op(*args)
+        return time.perf_counter() - t0
+
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(warmup):
+            call()
+
+        timings = []
+        started = time.perf_counter()
+        while len(timings) % cycle or (
+                len(timings) < max_ops and (len(timings) < min_ops or
+                                            time.perf_counter() - started < min_time)):
+            timings.append(call())
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return timings
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    timings = sorted(timings)
+    total = sum(timings)
+    return {
+        "ops": len(timings),
+        "ops_per_sec": round(len(timings) / total, 1) if total else 0.0,
+        "p50_us": round(percentile(timings, 50) * 1e6, 2),
+        "p95_us": round(percentile(timings, 95) * 1e6, 2),
+        "p99_us": round(percentile(timings, 99) * 1e6, 2),
+    }
+
+
+def run_case(case: Case, engine: str, min_time: float,
+             wanted: Callable[[str], bool] = lambda name: True) -> Dict[str, Dict[str, float]]:
+    """Benchmark every hot path (whose name is `wanted`) on one board."""
+    pathfinder_class = PATH_ENGINES[engine]
+    service = GameService(rows=case.rows, cols=case.cols, path_engine=engine)
+    results = {}
+
+    game_state = build_game(case)
+    board = game_state._compact
+    pathfinder = pathfinder_class(board)
+    queries = path_queries(board, PATH_QUERIES, random.Random(f"queries/{case.name}"))
+
+    for name in ("find_path", "find_path_simple"):
+        method = getattr(pathfinder, name)
+        cursor = iter(())
+
+        def query(method=method):
+            nonlocal cursor
+            pair = next(cursor, None)
+            if pair is None:
+                cursor = iter(queries)
+                pair = next(cursor)
+            return method(*pair)
+
+        if queries and wanted(f"{name}/{case.name}"):
+            results[f"{name}/{case.name}"] = summarize(
+                measure(query, min_time, min_ops=len(queries), max_ops=50_000,
+                        cycle=len(queries)))
+
+    # Hints reuse the game's move index, as in a live game
+    if wanted(f"find_hint/{case.name}"):
+        results[f"find_hint/{case.name}"] = summarize(
+            measure(lambda: service.find_hint(game_state), min_time, min_ops=5, max_ops=5_000))
+
+    # Every shuffle starts from the case's board: shuffling one state over
+    # and over would also time its growing event log and snapshots
+    def fresh_game() -> GameState:
+        fresh = build_game(case)
+        service._event_log(fresh)
+        return fresh
+
+    if board.remaining and wanted(f"shuffle_board/{case.name}"):
+        results[f"shuffle_board/{case.name}"] = summarize(
+            measure(service.shuffle_board, min_time, min_ops=5, max_ops=5_000, setup=fresh_game))
+
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """Names of benchmarks whose median is slower than the baseline allows."""
+    return [name for name, current in results.items()
+            if name in baseline and current["p50_us"] > baseline[name]["p50_us"] * (1 + tolerance)]
+
+
+def print_row(name: str, summary: Dict[str, float]) -> None:
+    print(f"{name:<44} {summary['ops_per_sec']:>10.0f} {summary['p50_us']:>10.1f} "
+          f"{summary['p95_us']:>10.1f} {summary['p99_us']:>10.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pathfinding hot paths.")
+    parser.add_argument("--engine", choices=sorted(PATH_ENGINES), default="bitboard")
+    parser.add_argument("--quick", action="store_true", help="Small boards only")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="Seconds per benchmark run (default 0.1)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per benchmark; the lowest median is kept (default 5)")
+    parser.add_argument("--filter", default="", help="Only benchmarks whose name contains this")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None,
+                        help="Baseline file (default benchmarks/baseline_<engine>.json)")
+    parser.add_argument("--tolerance", type=float, default=0.30,
+                        help="Allowed median slowdown vs baseline (default 0.30 = 30%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    if args.baseline is None:
+        args.baseline = os.path.join(BASELINE_DIR, f"baseline_{args.engine}.json")
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+
+    # Benchmark boards are not real games; keep the service log quiet
+    logging.getLogger("app.services.game_service").setLevel(logging.ERROR)
+
+    sizes = QUICK_SIZES if args.quick else BOARD_SIZES
+    cases = [Case(rows, cols, emptiness, ice)
+             for rows, cols in sizes for emptiness in EMPTINESS for ice in ICE_DENSITY]
+
+    print(f"engine={args.engine}  {len(cases)} boards  min_time={args.min_time}s  repeat={args.repeat}")
+    print(f"{'benchmark':<44} {'ops/sec':>10} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}")
+
+    # Best of `repeat` passes over all boards: a noisy neighbour only ever
+    # slows a run down, and spreading the runs of a benchmark over the whole
+    # suite keeps one slow stretch from spoiling all of them
+    results: Dict[str, Dict[str, float]] = {}
+
+    def run_passes(wanted: Callable[[str], bool]) -> None:
+        for _ in range(max(1, args.repeat)):
+            for case in cases:
+                for name, summary in run_case(case, args.engine, args.min_time, wanted).items():
+                    if name not in results or summary["p50_us"] < results[name]["p50_us"]:
+                        results[name] = summary
+
+    run_passes(lambda name: args.filter in name)
+    for name, summary in results.items():
+        print_row(name, summary)
+
+    regressed = [] if args.update_baseline else compare(results, baseline, args.tolerance)
+    if regressed:
+        # A real slowdown shows in every pass; give the suspects more passes
+        print(f"\nRe-running {len(regressed)} benchmark(s) slower than the baseline")
+        run_passes(lambda name: name in regressed)
+        for name in regressed:
+            print_row(name, results[name])
+        regressed = compare(results, baseline, args.tolerance)
+
+    report = {
+        "meta": {
+            "engine": args.engine,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({**report, "results": {**baseline, **results}}, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("No baseline to compare with (run with --update-baseline)")
+        return 0
+
+    if regressed:
+        print(f"\n❌ {len(regressed)} regression(s) (median > baseline +{args.tolerance:.0%}):")
+        for name in regressed:
+            print(f"  {name}: p50 {results[name]['p50_us']:.1f} us, "
+                  f"baseline {baseline[name]['p50_us']:.1f} us")
+        return 1
+
+    print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Wire format benchmark for Pikachu Kawaii game.
+
+Compares the JSON GameState (one object per cell) with the compact format
+(CompactGameState: grid packed into one base64 string) on the boards of
+benchmarks/hot_paths.py:
+
+- encode: state -> response bytes, the way FastAPI does it for the routes
+  (jsonable_encoder + json.dumps)
+- decode: response bytes -> pydantic model, plus the board for the compact
+  format (CompactBoard.from_bytes)
+- size: response bytes, raw and gzipped
+
+Run from backend/:
+    python -m benchmarks.wire_format            # all board sizes
+    python -m benchmarks.wire_format --quick    # small boards only
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import sys
+from typing import Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.board import CompactBoard
+from app.models.game import CompactGameState, GameState
+from app.services.game_service import GameService
+from .hot_paths import BOARD_SIZES, QUICK_SIZES, Case, build_game, measure, summarize
+
+
+def encode_json(service: GameService, game_state: GameState) -> bytes:
+    return json.dumps(jsonable_encoder({"game_state": service.export(game_state)})).encode()
+
+
+def encode_compact(service: GameService, game_state: GameState) -> bytes:
+    return json.dumps(jsonable_encoder({"game_state": service.export_compact(game_state)})).encode()
+
+
+def decode_json(body: bytes) -> GameState:
+    return GameState.model_validate(json.loads(body)["game_state"])
+
+
+def decode_compact(body: bytes) -> CompactBoard:
+    state = CompactGameState.model_validate(json.loads(body)["game_state"])
+    board = state.board
+    return CompactBoard.from_bytes(board.rows, board.cols, base64.b64decode(board.grid))
+
+
+def run_case(case: Case, min_time: float) -> Dict[str, Dict[str, float]]:
+    """Encode / decode timings and sizes of both formats on one board."""
+    service = GameService(rows=case.rows, cols=case.cols)
+    game_state = build_game(case)
+    results = {}
+
+    for name, encode, decode in (("json", encode_json, decode_json),
+                                 ("compact", encode_compact, decode_compact)):
+        body = encode(service, game_state)
+        results[f"encode/{name}/{case.name}"] = {
+            **summarize(measure(lambda: encode(service, game_state), min_time,
+                                min_ops=5, max_ops=20_000)),
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body)),
+        }
+        results[f"decode/{name}/{case.name}"] = summarize(
+            measure(lambda: decode(body), min_time, min_ops=5, max_ops=20_000))
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the GameState wire formats.")
+    parser.add_argument("--quick", action="store_true", help="Small boards, shorter runs")
+    parser.add_argument("--min-time", type=float, default=None,
+                        help="Seconds per benchmark (default 0.2, 0.05 with --quick)")
+    parser.add_argument("--output", default=None, help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = QUICK_SIZES if args.quick else BOARD_SIZES
+    min_time = args.min_time if args.min_time is not None else (0.05 if args.quick else 0.2)
+    # Half-cleared boards with some ice: a typical mid-game response
+    cases = [Case(rows, cols, 0.5, 0.1) for rows, cols in sizes]
+
+    print(f"{'benchmark':<36} {'p50 us':>10} {'p95 us':>10} {'bytes':>9} {'gzip':>8}")
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        case_results = run_case(case, min_time)
+        results.update(case_results)
+        for name, summary in case_results.items():
+            print(f"{name:<36} {summary['p50_us']:>10.1f} {summary['p95_us']:>10.1f} "
+                  f"{summary.get('bytes', ''):>9} {summary.get('gzip_bytes', ''):>8}")
+
+        for step in ("encode", "decode"):
+            plain = case_results[f"{step}/json/{case.name}"]["p50_us"]
+            packed = case_results[f"{step}/compact/{case.name}"]["p50_us"]
+            print(f"  {step} speedup: {plain / packed:.1f}x")
+        print()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
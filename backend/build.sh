@@ -4,4 +4,8 @@
 echo "Installing Python dependencies..."
 pip install -r requirements.txt
 
+echo "Building sprite atlas..."
+pip install Pillow
+python build_sprite_atlas.py --fetch || { echo "Sprite atlas build failed"; exit 1; }
+
 echo "Build completed successfully!"
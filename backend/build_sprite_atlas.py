@@ -0,0 +1,113 @@
+"""
+Sprite atlas builder for Pikachu Kawaii game.
+
+Packs the sprite of every pokemon in app/services/pokemon_data.py into one
+PNG on a uniform grid and writes app/static/sprites/atlas.png plus
+atlas.json, the coordinate map the backend serves at /api/sprites/atlas.json.
+Clients then load every sprite with one request, and no remote CDN is needed
+at runtime.
+
+Sprites are read from --source (default app/static/sprites/src, named
+<pokedex id>.png), the sprite set kept in the repository: the build needs no
+network. `--fetch` downloads the sprites missing from it from PokeAPI, to be
+committed there. The atlas itself is a build output and is not committed.
+
+Needs Pillow (pip install Pillow) to build; the server only serves the files.
+
+Run: python build_sprite_atlas.py [--source DIR] [--columns N] [--fetch]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import urllib.request
+
+from app.services.pokemon_data import POKEMON_LIST, SPRITE_URL
+from app.services.sprite_atlas import ATLAS_DIR, IMAGE_NAME, MANIFEST_NAME
+
+
+def sprite_path(source: str, pokemon: dict) -> str:
+    return os.path.join(source, f"{pokemon['pokedex_id']}.png")
+
+
+def missing_sprites(source: str) -> list:
+    """Pokemon whose sprite is not in `source`."""
+    return [pokemon for pokemon in POKEMON_LIST if not os.path.exists(sprite_path(source, pokemon))]
+
+
+def fetch_sprites(source: str) -> None:
+    """Download the sprites missing from `source`."""
+    os.makedirs(source, exist_ok=True)
+    for pokemon in missing_sprites(source):
+        print(f"Downloading {pokemon['name']}...")
+        urllib.request.urlretrieve(SPRITE_URL.format(pokemon["pokedex_id"]),
+                                   sprite_path(source, pokemon))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pack the pokemon sprites into one atlas.")
+    parser.add_argument("--source", default=os.path.join(ATLAS_DIR, "src"))
+    parser.add_argument("--output", default=ATLAS_DIR)
+    parser.add_argument("--columns", type=int, default=None,
+                        help="Sprites per atlas row (default: square-ish grid)")
+    parser.add_argument("--fetch", action="store_true",
+                        help="Download sprites missing from --source first")
+    args = parser.parse_args()
+
+    try:
+        from PIL import Image
+    except ImportError:
+        print("Building the atlas needs Pillow: pip install Pillow")
+        return 1
+
+    if args.fetch:
+        fetch_sprites(args.source)
+    missing = missing_sprites(args.source)
+    if missing:
+        print(f"{len(missing)} sprite(s) missing from {args.source}: "
+              f"{', '.join(pokemon['name'] for pokemon in missing)}")
+        print("Run python build_sprite_atlas.py --fetch once and commit the files")
+        return 1
+
+    sprites = [(pokemon, Image.open(sprite_path(args.source, pokemon)).convert("RGBA"))
+               for pokemon in POKEMON_LIST]
+
+    # Uniform frames: every sprite sits centred in a cell of the largest size
+    frame_w = max(image.width for _, image in sprites)
+    frame_h = max(image.height for _, image in sprites)
+    columns = args.columns or math.ceil(math.sqrt(len(sprites)))
+    rows = math.ceil(len(sprites) / columns)
+
+    atlas = Image.new("RGBA", (columns * frame_w, rows * frame_h), (0, 0, 0, 0))
+    frames = {}
+    for i, (pokemon, image) in enumerate(sprites):
+        x = (i % columns) * frame_w
+        y = (i // columns) * frame_h
+        atlas.paste(image, (x + (frame_w - image.width) // 2, y + (frame_h - image.height) // 2))
+        frames[str(pokemon["id"])] = {"x": x, "y": y, "w": frame_w, "h": frame_h,
+                                      "name": pokemon["name"]}
+
+    os.makedirs(args.output, exist_ok=True)
+    image_path = os.path.join(args.output, IMAGE_NAME)
+    atlas.save(image_path, optimize=True)
+
+    manifest = {
+        "width": atlas.width,
+        "height": atlas.height,
+        "columns": columns,
+        "rows": rows,
+        "frame": {"w": frame_w, "h": frame_h},
+        "sprites": frames,
+    }
+    with open(os.path.join(args.output, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"{len(frames)} sprites -> {image_path} "
+          f"({atlas.width}x{atlas.height}, {os.path.getsize(image_path)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
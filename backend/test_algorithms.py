@@ -5,6 +5,7 @@ Run: python test_algorithms.py
 """
 
 from app.models.game import Cell, CellType, Position
+from app.core.bitboard import BitboardPathFinder
 from app.core.pathfinder import PathFinder
 from app.services.game_service import GameService
 
@@ -183,6 +184,154 @@ def test_complexity_analysis():
         print(f"{size}x{size:<6} {cells:<10} {elapsed_ms:<15.4f}")
 
     print("\n✅ Time complexity is O(n) where n = rows × cols")
+
+    # Solvable boards (reverse construction) must stay within the latency budget
+    board_sizes = [(8, 12), (16, 24), (24, 36), (32, 48)]
+    repeats = 20
+    print(f"\nSolvable Board Generation ({repeats} boards each, level 10):")
+    print(f"{'Size':<10} {'Cells':<10} {'Mean (ms)':<12} {'Max (ms)':<12} {'Budget (ms)':<12}")
+    print("-" * 56)
+
+    for rows, cols in board_sizes:
+        service = GameService(rows=rows, cols=cols)
+        timings = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            service.create_new_game(level=10, solvable=True)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        mean_ms = sum(timings) / len(timings)
+        max_ms = max(timings)
+        status = "✅" if max_ms <= service.generation_budget_ms else "❌"
+
+        print(f"{rows}x{cols:<7} {rows * cols:<10} {mean_ms:<12.4f} {max_ms:<12.4f} "
+              f"{service.generation_budget_ms:<8.1f} {status}")
+
+    print()
+
+
+def test_solver_throughput():
+    """Measure full-board solver throughput (nodes/sec)."""
+    print("=" * 60)
+    print("TEST 6: Solver Throughput (DFS + Zobrist transposition table)")
+    print("=" * 60)
+
+    board_sizes = [(6, 8), (8, 12), (12, 16)]
+    print(f"\n{'Size':<10} {'Solvable':<10} {'Nodes':<10} {'Time (ms)':<12} {'Nodes/sec':<12}")
+    print("-" * 54)
+
+    for rows, cols in board_sizes:
+        service = GameService(rows=rows, cols=cols)
+        game_state = service.create_new_game(level=8, seed=rows * cols)
+
+        result = service.solve(game_state, max_nodes=20_000, time_limit_ms=2000.0)
+        rate = result.nodes / (result.elapsed_ms / 1000) if result.elapsed_ms else 0.0
+
+        print(f"{rows}x{cols:<7} {str(result.solvable):<10} {result.nodes:<10} "
+              f"{result.elapsed_ms:<12.1f} {rate:<12.0f}")
+
+    print()
+
+
+def test_event_replay():
+    """Test that replaying the event log rebuilds the live game."""
+    print("=" * 60)
+    print("TEST 7: Event Log Replay")
+    print("=" * 60)
+
+    service = GameService(rows=6, cols=8)
+    game_state = service.create_new_game(level=1, seed=7)
+
+    # Three moves, an undo, a redo and a shuffle
+    for _ in range(3):
+        pos1, pos2 = service.find_hint(game_state)
+        service.make_move(game_state, pos1, pos2)
+    service.undo(game_state)
+    service.redo(game_state)
+    service.shuffle_board(game_state)
+
+    replayed = service.state_at(game_state, len(game_state._log))
+    live = service.export(game_state)
+
+    assert replayed.board.grid == live.board.grid, "replayed grid differs from the live game"
+    assert replayed.board.score == live.board.score
+    print(f"Replayed {len(game_state._log)} events: grid and score match the live game")
+    print()
+
+
+def random_grid(rng, rows, cols, density, types=4, frozen=0.1):
+    """Random grid (not necessarily paired): small type counts give many pairs."""
+    grid = [[Cell(type=CellType.EMPTY) for _ in range(cols)] for _ in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            if rng.random() < density:
+                grid[row][col] = Cell(type=CellType.POKEMON, pokemon_id=rng.randint(1, types),
+                                      is_frozen=rng.random() < frozen)
+    return grid
+
+
+def test_engine_cross_checks():
+    """Cross-check the path engines against each other on seeded random boards."""
+    print("=" * 60)
+    print("TEST 8: Path Engine Cross-Checks (seeded random boards)")
+    print("=" * 60)
+
+    import random
+
+    try:
+        from app.core.batch_eval import evaluate_boards, stack_boards
+        import numpy  # noqa: F401
+    except ImportError:
+        evaluate_boards = None
+
+    rng = random.Random(2024)
+    boards = pairs_checked = 0
+
+    for _ in range(150):
+        rows, cols = rng.randint(2, 8), rng.randint(2, 10)
+        grid = random_grid(rng, rows, cols, density=rng.choice([0.3, 0.6, 0.9]))
+        simple = PathFinder(grid, rows, cols)
+        bitboard = BitboardPathFinder(grid, rows, cols)
+
+        # Reference: find_path_simple on every same-type pair
+        expected = set()
+        for idx1 in range(rows * cols):
+            for idx2 in range(idx1 + 1, rows * cols):
+                pos1 = Position(row=idx1 // cols, col=idx1 % cols)
+                pos2 = Position(row=idx2 // cols, col=idx2 % cols)
+                reference = simple.find_path_simple(pos1, pos2)
+
+                # Bitboard engine vs simple finder
+                fast = bitboard.find_path_simple(pos1, pos2)
+                assert (fast.is_valid, fast.turns) == (reference.is_valid, reference.turns), \
+                    f"bitboard differs at {pos1} {pos2}"
+
+                # 0-1 BFS vs simple finder
+                searched = simple.find_path(pos1, pos2, max_turns=2, use_border=True)
+                assert (searched.is_valid, searched.turns) == (reference.is_valid, reference.turns), \
+                    f"0-1 BFS differs at {pos1} {pos2}"
+
+                if reference.is_valid:
+                    expected.add((simple.board.index(pos1.row, pos1.col),
+                                  simple.board.index(pos2.row, pos2.col), reference.turns))
+                pairs_checked += 1
+
+        # One-sweep all_pairs vs one search per pair
+        assert set(simple.all_pairs()) == expected, "all_pairs differs from per-pair search"
+        assert set(bitboard.all_pairs()) == expected, "bitboard all_pairs differs"
+
+        # Vectorized batch evaluation vs per-pair search
+        if evaluate_boards is not None:
+            ids, frozen = stack_boards([simple.board])
+            assert evaluate_boards(ids, frozen).move_counts[0] == len(expected), \
+                "batch_eval move count differs"
+        boards += 1
+
+    print(f"{boards} boards, {pairs_checked} cell pairs: bitboard, 0-1 BFS, all_pairs"
+          f"{' and batch_eval' if evaluate_boards is not None else ''} match find_path_simple")
+    if evaluate_boards is None:
+        print("(batch_eval skipped: NumPy not installed, see requirements-tools.txt)")
     print()
 
 
@@ -197,6 +346,9 @@ def main():
     test_hint_system()
     test_board_generation()
     test_complexity_analysis()
+    test_solver_throughput()
+    test_event_replay()
+    test_engine_cross_checks()
 
     print("=" * 60)
     print("ALL TESTS COMPLETED")
@@ -0,0 +1,59 @@
+"""
+Difficulty tuning tool for Pikachu Kawaii game.
+
+Generates many boards per level with GameService.create_new_game and
+evaluates them in one vectorized batch (app/core/batch_eval.py): valid
+move counts and the rate of boards that start without any move.
+
+Boards are generated solvable, like POST /game/new does by default;
+`--random` measures plain random boards instead (solvable=false).
+
+Needs NumPy: pip install -r requirements-tools.txt
+
+Run: python tune_difficulty.py [boards] [rows] [cols] [max_level] [--random]
+"""
+
+import argparse
+import logging
+import time
+
+from app.core.batch_eval import evaluate_boards, stack_boards
+from app.services.game_service import GameService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure move counts of generated boards per level.")
+    parser.add_argument("boards", nargs="?", type=int, default=10_000, help="Boards per level")
+    parser.add_argument("rows", nargs="?", type=int, default=8)
+    parser.add_argument("cols", nargs="?", type=int, default=12)
+    parser.add_argument("max_level", nargs="?", type=int, default=10)
+    parser.add_argument("--random", action="store_true",
+                        help="Plain random boards instead of solvable ones (the /game/new default)")
+    args = parser.parse_args()
+    boards, rows, cols, max_level = args.boards, args.rows, args.cols, args.max_level
+    solvable = not args.random
+
+    # Generation-budget warnings are expected when generating in bulk
+    logging.getLogger("app.services.game_service").setLevel(logging.ERROR)
+    service = GameService(rows=rows, cols=cols)
+
+    print(f"{boards} {'solvable' if solvable else 'random'} boards per level, {rows}x{cols}")
+    print(f"{'level':>5}  {'mean moves':>10}  {'min':>4}  {'dead %':>7}  "
+          f"{'gen s':>6}  {'eval s':>6}")
+
+    for level in range(1, max_level + 1):
+        started = time.perf_counter()
+        games = [service.create_new_game(level=level, solvable=solvable) for _ in range(boards)]
+        ids, frozen = stack_boards(games)
+        generated = time.perf_counter()
+
+        result = evaluate_boards(ids, frozen)
+        evaluated = time.perf_counter()
+
+        print(f"{level:>5}  {result.move_counts.mean():>10.2f}  {result.move_counts.min():>4}  "
+              f"{100 * result.dead.mean():>6.2f}%  {generated - started:>6.2f}  "
+              f"{evaluated - generated:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,8 @@ function App() {
       });
   }, []);
 
-  // Timer countdown effect
+  // Timer countdown effect (display only: the server keeps the real clock
+  // and every response resyncs time_remaining)
   useEffect(() => {
     if (!gameState || gameState.game_over || gameState.victory) return;
 
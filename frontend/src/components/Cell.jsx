@@ -1,10 +1,11 @@
 import React from 'react';
 import './Cell.css';
-import { getPokemonSprite, getPokemonName } from '../services/pokemonSprites';
+import { getPokemonSprite, getPokemonName, getSpriteStyle } from '../services/pokemonSprites';
 
 function Cell({ cell, row, col, isSelected, isHinted, isFading, onClick, disabled }) {
   const isEmpty = cell.type === 'empty';
   const isFrozen = cell.is_frozen;
+  const spriteStyle = isEmpty ? null : getSpriteStyle(cell.pokemon_id);
 
   const getClassName = () => {
     const classes = ['cell'];
@@ -23,12 +24,21 @@ function Cell({ cell, row, col, isSelected, isHinted, isFading, onClick, disable
     <div className={getClassName()} onClick={onClick}>
       {!isEmpty && (
         <>
-          <img
-            src={getPokemonSprite(cell.pokemon_id)}
-            alt={getPokemonName(cell.pokemon_id)}
-            className="pokemon-sprite"
-            draggable="false"
-          />
+          {spriteStyle ? (
+            <div
+              role="img"
+              aria-label={getPokemonName(cell.pokemon_id)}
+              className="pokemon-sprite atlas"
+              style={spriteStyle}
+            />
+          ) : (
+            <img
+              src={getPokemonSprite(cell.pokemon_id)}
+              alt={getPokemonName(cell.pokemon_id)}
+              className="pokemon-sprite"
+              draggable="false"
+            />
+          )}
           {isFrozen && <div className="ice-overlay">❄️</div>}
         </>
       )}
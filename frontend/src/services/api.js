@@ -3,13 +3,56 @@ import axios from 'axios';
 // Use environment variable for API URL, fallback to localhost for development
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
 
+// Full game states come in the compact wire format: the grid packed into
+// one base64 string, a byte per cell (see CompactGameState on the backend)
+const COMPACT_MEDIA_TYPE = 'application/vnd.pokekawaii.compact+json';
+const ICE_BYTE = 0x7f;
+const FROZEN_BIT = 0x80;
+
 const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
     'Content-Type': 'application/json',
+    Accept: `${COMPACT_MEDIA_TYPE}, application/json`,
   },
 });
 
+/**
+ * Unpack a compact game state into the regular one (grid of cell objects);
+ * regular states are returned unchanged
+ */
+export const decodeGameState = (state) => {
+  const board = state?.board;
+  if (!board || typeof board.grid !== 'string') return state;
+
+  const bytes = atob(board.grid);
+  const grid = [];
+  for (let row = 0; row < board.rows; row++) {
+    const cells = [];
+    for (let col = 0; col < board.cols; col++) {
+      const byte = bytes.charCodeAt(row * board.cols + col);
+      const id = byte & ICE_BYTE;
+      cells.push({
+        type: id === 0 ? 'empty' : id === ICE_BYTE ? 'ice' : 'pokemon',
+        pokemon_id: id === 0 || id === ICE_BYTE ? null : id,
+        is_frozen: (byte & FROZEN_BIT) !== 0,
+      });
+    }
+    grid.push(cells);
+  }
+  return { ...state, board: { ...board, grid } };
+};
+
+api.interceptors.response.use((response) => {
+  const data = response.data;
+  if (data?.game_state) {
+    data.game_state = decodeGameState(data.game_state);
+  } else if (data?.board) {
+    response.data = decodeGameState(data);
+  }
+  return response;
+});
+
 export const gameAPI = {
   createGame: async (level = 1) => {
     const response = await api.post('/game/new', null, { params: { level } });
@@ -39,10 +82,18 @@ export const gameAPI = {
     return response.data;
   },
 
-  updateTime: async (gameId, secondsElapsed) => {
-    const response = await api.post(`/game/${gameId}/time`, null, {
-      params: { seconds_elapsed: secondsElapsed },
-    });
+  undoMove: async (gameId) => {
+    const response = await api.post(`/game/${gameId}/undo`);
+    return response.data;
+  },
+
+  redoMove: async (gameId) => {
+    const response = await api.post(`/game/${gameId}/redo`);
+    return response.data;
+  },
+
+  getTime: async (gameId) => {
+    const response = await api.get(`/game/${gameId}/time`);
     return response.data;
   },
 };
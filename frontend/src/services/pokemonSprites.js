@@ -1,10 +1,14 @@
 /**
  * Pokemon sprite configuration
  *
- * Uses PokeAPI sprites from GitHub CDN
+ * Sprites come from the backend's sprite atlas: one image holding every
+ * sprite plus a JSON map of their rectangles (GET /sprites/atlas.json).
+ * Without an atlas, the PokeAPI sprites on the GitHub CDN are used.
  * Source: https://github.com/PokeAPI/sprites
  */
 
+import api from './api';
+
 export const POKEMON_SPRITES = {
   1: {
     name: 'Pikachu',
@@ -88,6 +92,45 @@ export const POKEMON_SPRITES = {
   }
 };
 
+// Loaded atlas: { url, width, height, sprites: { id: { x, y, w, h } } }
+let atlas = null;
+
+/**
+ * Fetch the atlas map and load its image (one request for all sprites)
+ */
+export const loadSpriteAtlas = async () => {
+  const { data } = await api.get('/sprites/atlas.json');
+  const url = `${api.defaults.baseURL}/sprites/${data.image}`;
+
+  await new Promise((resolve, reject) => {
+    const img = new Image();
+    img.onload = resolve;
+    img.onerror = reject;
+    img.src = url;
+  });
+
+  atlas = { ...data, url };
+  return atlas;
+};
+
+/**
+ * CSS background showing a Pokemon from the atlas, or null without an atlas
+ */
+export const getSpriteStyle = (pokemonId) => {
+  const frame = atlas?.sprites[pokemonId];
+  if (!frame) return null;
+
+  // Percentages keep the sprite scaled to the cell, whatever its size
+  const percent = (offset, frameSize, atlasSize) =>
+    atlasSize === frameSize ? 0 : (offset / (atlasSize - frameSize)) * 100;
+
+  return {
+    backgroundImage: `url(${atlas.url})`,
+    backgroundSize: `${(atlas.width / frame.w) * 100}% ${(atlas.height / frame.h) * 100}%`,
+    backgroundPosition: `${percent(frame.x, frame.w, atlas.width)}% ${percent(frame.y, frame.h, atlas.height)}%`,
+  };
+};
+
 /**
  * Get sprite URL for a Pokemon ID
  */
@@ -103,9 +146,23 @@ export const getPokemonName = (pokemonId) => {
 };
 
 /**
- * Preload all Pokemon sprites for better performance
+ * Preload all Pokemon sprites for better performance: the atlas if the
+ * backend has one, otherwise every CDN sprite
  */
-export const preloadPokemonSprites = () => {
+export const preloadPokemonSprites = async () => {
+  try {
+    await loadSpriteAtlas();
+    return Object.values(POKEMON_SPRITES).map(pokemon => pokemon.name);
+  } catch (error) {
+    const reason = error.response?.status === 404
+      ? 'the backend has no atlas (run backend/build_sprite_atlas.py)'
+      : error.message;
+    console.warn(
+      `Sprite atlas unavailable: ${reason}. Falling back to ` +
+      `${Object.keys(POKEMON_SPRITES).length} requests to the PokeAPI CDN.`
+    );
+  }
+
   return Promise.all(
     Object.values(POKEMON_SPRITES).map(pokemon => {
       return new Promise((resolve, reject) => {